@@ -0,0 +1,57 @@
+from __future__ import annotations
+import argparse, json, random, time
+from src.labeler import Ontology, InvoiceLabeler
+
+# Trigger phrases of the leaf-generator rules plus filler that no existing
+# leaf matches, so lines fall through to _apply_leaf_generator
+TRIGGERS = {
+    "output": ["Management Fee", "Admin Fee", "Biaya Jasa", "Campaign", "Placement", "Device"],
+    "input": ["Subscription", "License", "Hosting", "Server", "Cloud", "Biaya"],
+}
+FILLER = ["PT", "Maju", "Jaya", "Sentosa", "Periode", "Jan", "Okt", "2023", "12/05/2023",
+          "Kopi", "Nusantara", "Cabang", "Jakarta", "Surabaya", "Unit", "Paket", "Q3"]
+
+def make_lines(labeler: InvoiceLabeler, side: str, n: int, seed: int) -> list:
+    rng = random.Random(seed)
+    lines = []
+    while len(lines) < n:
+        words = rng.sample(FILLER, rng.randint(2, 6))
+        words.insert(rng.randint(0, len(words)), rng.choice(TRIGGERS[side]))
+        text = " ".join(words)
+        best, _, _ = labeler._match_best_existing_leaf(text, side)
+        if best is None:
+            lines.append(text)
+    return lines
+
+def main():
+    ap = argparse.ArgumentParser(description="Micro-benchmark: labeling throughput on unmatched lines")
+    ap.add_argument("--ontology", default="ontology/ontology_grablike_v2.json")
+    ap.add_argument("--new_nodes", default=None, help="Optional new_nodes_append.json to merge first")
+    ap.add_argument("--lines", type=int, default=5000)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=13)
+    args = ap.parse_args()
+
+    with open(args.ontology, "r", encoding="utf-8") as f:
+        onto_json = json.load(f)
+    if args.new_nodes:
+        with open(args.new_nodes, "r", encoding="utf-8") as f:
+            onto_json["nodes"] = onto_json["nodes"] + json.load(f)
+
+    t0 = time.perf_counter()
+    lab = InvoiceLabeler(Ontology(onto_json))
+    print(f"Built labeler over {len(lab.onto.nodes)} nodes in {time.perf_counter() - t0:.3f}s")
+
+    for side in ("output", "input"):
+        lines = make_lines(lab, side, args.lines, args.seed)
+        best = float("inf")
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            for text in lines:
+                lab.label_one(text, side)
+            best = min(best, time.perf_counter() - t0)
+        print(f"{side:>6}: {len(lines)} unmatched lines, best of {args.repeat}: "
+              f"{best:.3f}s ({len(lines) / best:,.0f} lines/s)")
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,42 @@
 from __future__ import annotations
 import argparse, json
+from collections import deque
+from multiprocessing import Pool
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import pandas as pd
-from src.utils import read_invoice_xlsx, normalize_text
+from src.utils import iter_invoice_xlsx, normalize_text
 from src.labeler import Ontology, InvoiceLabeler
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--ontology", required=True)
-    ap.add_argument("--faktur_keluaran", required=True)
-    ap.add_argument("--faktur_masukan", required=True)
-    ap.add_argument("--out_csv", default="dataset_labeled.csv")
-    ap.add_argument("--out_new_nodes", default="new_nodes_append.json")
-    args = ap.parse_args()
+OUT_COLUMNS = [
+    "invoice_side", "invoice_text", "invoice_text_norm", "primary_label_id",
+    "ancestor_path", "confidence", "evidence_terms", "leaf_generator_rule_id",
+]
 
-    onto = Ontology.load(args.ontology)
-    lab = InvoiceLabeler(onto)
+# Per-process labeler, built once by _init_worker (or in-process for --workers 1)
+_labeler: Optional[InvoiceLabeler] = None
 
-    out_df = read_invoice_xlsx(args.faktur_keluaran)
-    out_df["invoice_side"] = "output"
+def _init_worker(ontology_path: str, cache_size: int) -> None:
+    global _labeler
+    _labeler = InvoiceLabeler(Ontology.load(ontology_path), cache_size=cache_size)
 
-    in_df = read_invoice_xlsx(args.faktur_masukan)
-    in_df["invoice_side"] = "input"
-
-    df = pd.concat([out_df, in_df], ignore_index=True)
+def _label_shard(records: List[Tuple[str, str, str]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Label (invoice_text, invoice_text_norm, invoice_side) records.
+    Each distinct (normalized text, side) is labeled once and fanned back
+    out to its rows. Returns (rows, new_nodes, stats).
+    """
+    before = dict(_labeler.cache_stats)
+    labeled: Dict[Tuple[str, str], Any] = {}
     results = []
-    new_nodes = []
-
-    for _, row in df.iterrows():
-        text = normalize_text(row["invoice_text_norm"])
-        side = row["invoice_side"]
-        res = lab.label_one(text, side)
+    new_nodes: Dict[str, Dict[str, Any]] = {}
+    for invoice_text, text_norm, side in records:
+        text = normalize_text(text_norm)
+        res = labeled.get((text, side))
+        if res is None:
+            res = labeled[(text, side)] = _labeler.label_cached(text, side)
         results.append({
             "invoice_side": res.invoice_side,
-            "invoice_text": row["invoice_text"],
+            "invoice_text": invoice_text,
             "invoice_text_norm": text,
             "primary_label_id": res.primary_label_id,
             "ancestor_path": " > ".join(res.ancestor_path),
@@ -41,22 +45,112 @@ def main():
             "leaf_generator_rule_id": res.leaf_generator_rule_id or ""
         })
         if res.suggested_new_leaf_node:
-            new_nodes.append(res.suggested_new_leaf_node)
+            new_nodes.setdefault(res.suggested_new_leaf_node["id"], res.suggested_new_leaf_node)
+    stats = {
+        "rows": len(records),
+        "unique": len(labeled),
+        "cache_hits": _labeler.cache_stats["hits"] - before["hits"],
+        "labeled": _labeler.cache_stats["misses"] - before["misses"],
+    }
+    return results, list(new_nodes.values()), stats
+
+def _shards(sources: List[Tuple[str, str]], chunk_size: int) -> Iterator[List[Tuple[str, str, str]]]:
+    """Stream (xlsx path, invoice side) sources as shards of at most chunk_size records"""
+    for path, side in sources:
+        for chunk in iter_invoice_xlsx(path, chunk_size=chunk_size):
+            yield list(zip(chunk["invoice_text"], chunk["invoice_text_norm"], [side] * len(chunk)))
+
+class _ShardWriter:
+    """Appends labeled shards to a CSV or Parquet file as they arrive"""
+
+    def __init__(self, path: str, fmt: str):
+        self.path = path
+        self.fmt = fmt
+        self.rows = 0
+        self._parquet = None
+        if fmt == "csv":
+            pd.DataFrame(columns=OUT_COLUMNS).to_csv(path, index=False)
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        chunk = pd.DataFrame(rows, columns=OUT_COLUMNS)
+        if self.fmt == "csv":
+            chunk.to_csv(self.path, mode="a", header=False, index=False)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        if self.fmt == "parquet":
+            if self._parquet is None:
+                pd.DataFrame(columns=OUT_COLUMNS).to_parquet(self.path, index=False)
+            else:
+                self._parquet.close()
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--ontology", required=True)
+    ap.add_argument("--faktur_keluaran", required=True)
+    ap.add_argument("--faktur_masukan", required=True)
+    ap.add_argument("--out_csv", default="dataset_labeled.csv",
+                    help="Output path; a .parquet extension writes Parquet (needs pyarrow)")
+    ap.add_argument("--out_new_nodes", default="new_nodes_append.json")
+    ap.add_argument("--workers", type=int, default=1, help="Labeling processes (1 = in-process)")
+    ap.add_argument("--chunk_size", type=int, default=20000, help="Rows per shard")
+    ap.add_argument("--cache_size", type=int, default=100000,
+                    help="Per-process LRU of labeled (text, side) pairs (0 disables)")
+    args = ap.parse_args()
+
+    # Both workbooks are streamed; only a few shards are in memory at a time
+    sources = [(args.faktur_keluaran, "output"), (args.faktur_masukan, "input")]
+    fmt = "parquet" if args.out_csv.lower().endswith(".parquet") else "csv"
+    writer = _ShardWriter(args.out_csv, fmt)
+
+    # de-duplicate new nodes by id (first occurrence in row order wins)
+    new_nodes: Dict[str, Dict[str, Any]] = {}
+    stats = {"rows": 0, "unique": 0, "cache_hits": 0, "labeled": 0}
+
+    def merge(shard_result):
+        rows, nodes, shard_stats = shard_result
+        writer.write(rows)
+        for n in nodes:
+            new_nodes.setdefault(n["id"], n)
+        for k, v in shard_stats.items():
+            stats[k] += v
 
-    out = pd.DataFrame(results)
-    out.to_csv(args.out_csv, index=False)
+    if args.workers > 1:
+        # Pool.imap would read every shard up front; keep a bounded window of
+        # submitted shards instead and drain it in submission order, so
+        # output rows stay in input order
+        max_in_flight = args.workers * 2
+        with Pool(args.workers, initializer=_init_worker, initargs=(args.ontology, args.cache_size)) as pool:
+            pending = deque()
+            for shard in _shards(sources, args.chunk_size):
+                if len(pending) >= max_in_flight:
+                    merge(pending.popleft().get())
+                pending.append(pool.apply_async(_label_shard, (shard,)))
+            while pending:
+                merge(pending.popleft().get())
+    else:
+        _init_worker(args.ontology, args.cache_size)
+        for shard in _shards(sources, args.chunk_size):
+            merge(_label_shard(shard))
+    writer.close()
 
-    # de-duplicate new nodes by id
-    seen = set()
-    uniq = []
-    for n in new_nodes:
-        if n["id"] not in seen:
-            uniq.append(n); seen.add(n["id"])
+    uniq = list(new_nodes.values())
     with open(args.out_new_nodes, "w", encoding="utf-8") as f:
         json.dump(uniq, f, ensure_ascii=False, indent=2)
 
-    print(f"Wrote {args.out_csv} with {len(out)} rows.")
+    print(f"Wrote {args.out_csv} with {writer.rows} rows.")
     print(f"Wrote {args.out_new_nodes} with {len(uniq)} suggested new leaf nodes.")
+    print(f"Labeled {stats['labeled']} texts for {stats['rows']} rows "
+          f"({stats['unique']} unique per shard, {stats['cache_hits']} served from the label cache).")
 
 if __name__ == "__main__":
     main()
@@ -1,7 +1,10 @@
 from __future__ import annotations
 import json, re
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from typing import Dict, List, Optional, Tuple, Any
+from .matcher import MultiPatternMatcher
+from .utils import normalize_text
 
 @dataclass
 class LabelResult:
@@ -24,28 +27,110 @@ class Ontology:
             p = n.get("parent")
             if p:
                 self.children.setdefault(p, []).append(n["id"])
+        self._build_index()
 
-    @classmethod
-    def load(cls, path: str) -> "Ontology":
-        with open(path, "r", encoding="utf-8") as f:
-            return cls(json.load(f))
+    def _build_index(self) -> None:
+        # Compiled index: ancestor tuples (root..node), depths and merged
+        # facets per node, computed once instead of walking parents per call
+        self.ancestors: Dict[str, Tuple[str, ...]] = {}
+        for nid in self.nodes:
+            self.ancestors[nid] = self._walk_ancestors(nid)
+        self.depths: Dict[str, int] = {nid: len(path) for nid, path in self.ancestors.items()}
+        self._merged_facets: Dict[str, Dict[str, Any]] = {}
+        for nid, path in self.ancestors.items():
+            facets = {}
+            for aid in path:
+                f = self.nodes.get(aid, {}).get("facets", {})
+                if isinstance(f, dict):
+                    facets.update(f)
+            self._merged_facets[nid] = facets
 
-    def get_ancestors(self, node_id: str) -> List[str]:
+    def _walk_ancestors(self, node_id: str) -> Tuple[str, ...]:
         path = []
         cur = node_id
         while cur:
+            known = self.ancestors.get(cur) if cur != node_id else None
+            if known is not None:
+                return known + tuple(reversed(path))
             path.append(cur)
             cur = self.nodes.get(cur, {}).get("parent")
-        return list(reversed(path))
+        return tuple(reversed(path))
+
+    @classmethod
+    def load(cls, path: str) -> "Ontology":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def get_ancestors(self, node_id: str) -> List[str]:
+        path = self.ancestors.get(node_id)
+        if path is None:
+            path = self._walk_ancestors(node_id)
+        return list(path)
+
+    def nodes_under(self, root_id: str) -> List[str]:
+        """Ids of all nodes with root_id on their ancestor path, in ontology order"""
+        return [nid for nid, path in self.ancestors.items() if root_id in path]
 
     def merge_facets(self, node_id: str) -> Dict[str, Any]:
         # Merge facets from ancestors to leaf (leaf wins)
-        facets = {}
-        for nid in self.get_ancestors(node_id):
-            f = self.nodes.get(nid, {}).get("facets", {})
-            if isinstance(f, dict):
-                facets.update(f)
-        return facets
+        facets = self._merged_facets.get(node_id)
+        if facets is None:
+            facets = {}
+            for nid in self.get_ancestors(node_id):
+                f = self.nodes.get(nid, {}).get("facets", {})
+                if isinstance(f, dict):
+                    facets.update(f)
+            return facets
+        return dict(facets)
+
+# Leaf-id key extraction: drop period/month words and dates, then keep
+# the first few longer alphanumeric tokens
+_KEY_MONTHS_RE = re.compile(r"(?i)\b(periode|period|jan|feb|mar|apr|mei|jun|jul|aug|agu|sep|oct|okt|nov|dec|des)\b")
+_KEY_DATES_RE = re.compile(r"\b20\d{2}\b|\b\d{1,2}/\d{1,2}/\d{2,4}\b|\b\d{1,2}-\d{1,2}-\d{2,4}\b")
+_KEY_NON_ALNUM_RE = re.compile(r"[^0-9A-Za-z]+")
+
+@dataclass(frozen=True)
+class _LeafRule:
+    """A leaf_generator rule with its regexes and keyword tests compiled"""
+    rule_id: str
+    test: re.Pattern                   # if_text_matches, as written
+    evidence: re.Pattern               # same pattern, forced case-insensitive
+    parent: Optional[str]
+    candidates: Tuple[Tuple[str, Tuple[str, ...]], ...]  # (parent, lowercased keywords)
+
+    @classmethod
+    def compile(cls, rule: Dict[str, Any]) -> "_LeafRule":
+        return cls(
+            rule_id=rule["id"],
+            test=re.compile(rule["if_text_matches"]),
+            evidence=re.compile(rule["if_text_matches"], re.IGNORECASE),
+            parent=rule.get("default_parent") or rule.get("then_assign_parent"),
+            candidates=tuple(
+                (c["parent"], tuple(k.lower() for k in c.get("if_contains_any", [])))
+                for c in rule.get("then_assign_parent_candidates") or []
+            ),
+        )
+
+def _leaf_key(text: str) -> str:
+    # create leaf id key (very conservative: do not include dates)
+    key = _KEY_MONTHS_RE.sub(" ", text)
+    key = _KEY_DATES_RE.sub(" ", key)
+    key = _KEY_NON_ALNUM_RE.sub("_", key).strip("_")
+    return "_".join([t for t in key.split("_") if len(t) > 2][:6]) or "GENERIC"
+
+def _copy_result(res: LabelResult) -> LabelResult:
+    # Fresh containers so callers can't alter a cached result
+    node = res.suggested_new_leaf_node
+    if node is not None:
+        node = {**node, "crosswalk": {k: list(v) for k, v in node["crosswalk"].items()},
+                "facets": dict(node["facets"])}
+    return replace(
+        res,
+        ancestor_path=list(res.ancestor_path),
+        facets_resolved=dict(res.facets_resolved),
+        evidence_terms=list(res.evidence_terms),
+        suggested_new_leaf_node=node,
+    )
 
 def _compile_patterns(node: Dict[str, Any]) -> List[re.Pattern]:
     pats = []
@@ -59,11 +144,40 @@ def _compile_patterns(node: Dict[str, Any]) -> List[re.Pattern]:
     return pats
 
 class InvoiceLabeler:
-    def __init__(self, ontology: Ontology):
+    # Invoice side -> VAT side root whose subtree holds its candidate labels
+    SIDE_ROOTS = {"output": "PPN_OUTPUT", "input": "PPN_INPUT"}
+
+    def __init__(self, ontology: Ontology, cache_size: int = 100_000):
         self.onto = ontology
+        # LRU of label_cached results keyed by (normalized text, side)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, str], LabelResult]" = OrderedDict()
+        self.cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
         # Precompile patterns for all nodes
         self.node_patterns: Dict[str, List[re.Pattern]] = {nid: _compile_patterns(n) for nid, n in self.onto.nodes.items()}
         self.leaf_rules = ontology.ontology.get("leaf_generator", {}).get("rules", [])
+        # Leaf-generator rules compiled once, grouped by scope in rule order
+        self.side_leaf_rules: Dict[str, List[_LeafRule]] = {}
+        for rule in self.leaf_rules:
+            self.side_leaf_rules.setdefault(rule.get("scope"), []).append(_LeafRule.compile(rule))
+        # Per side: (node id, pattern index range, depth) of candidate nodes
+        # that have patterns, plus one matcher over all of their patterns
+        self.side_candidates: Dict[str, List[Tuple[str, range, int]]] = {}
+        self.side_matchers: Dict[str, MultiPatternMatcher] = {}
+        self._pattern_owner: Dict[str, List[int]] = {}  # pattern index -> candidate index
+        for side, root in self.SIDE_ROOTS.items():
+            candidates = []
+            patterns: List[re.Pattern] = []
+            owner: List[int] = []
+            for nid in self.onto.nodes_under(root):
+                pats = self.node_patterns[nid]
+                if pats:
+                    owner.extend([len(candidates)] * len(pats))
+                    candidates.append((nid, range(len(patterns), len(patterns) + len(pats)), self.onto.depths[nid]))
+                    patterns.extend(pats)
+            self.side_candidates[side] = candidates
+            self.side_matchers[side] = MultiPatternMatcher(patterns)
+            self._pattern_owner[side] = owner
 
     def _match_best_existing_leaf(self, text: str, invoice_side: str) -> Tuple[Optional[str], List[str], int]:
         """
@@ -73,27 +187,20 @@ class InvoiceLabeler:
         best = None
         best_score = 0
         best_evidence = []
-        for nid, node in self.onto.nodes.items():
-            # Restrict to side roots
-            if invoice_side == "output":
-                if "PPN_OUTPUT" not in self.onto.get_ancestors(nid):
-                    continue
-            elif invoice_side == "input":
-                if "PPN_INPUT" not in self.onto.get_ancestors(nid):
-                    continue
-            else:
-                continue
+        matcher = self.side_matchers.get(invoice_side)
+        if matcher is None:
+            return best, best_evidence, best_score
+        found = matcher.search_all(text)
+        if not found:
+            return best, best_evidence, best_score
 
-            pats = self.node_patterns.get(nid, [])
-            if not pats:
-                continue
-            matches = []
-            for pat in pats:
-                m = pat.search(text)
-                if m:
-                    matches.append(m.group(0))
+        # Visit only nodes with a hit, in ontology order (ties keep the first)
+        candidates = self.side_candidates[invoice_side]
+        owner = self._pattern_owner[invoice_side]
+        for cid in sorted({owner[pid] for pid in found}):
+            nid, pattern_ids, depth = candidates[cid]
+            matches = [found[pid] for pid in pattern_ids if pid in found]
             if matches:
-                depth = len(self.onto.get_ancestors(nid))
                 score = len(matches) * 10 + depth  # pattern count dominates, depth breaks ties
                 if score > best_score:
                     best = nid
@@ -106,30 +213,26 @@ class InvoiceLabeler:
         If rule matches, suggest a new leaf node under chosen parent.
         Returns (parent_leaf_or_group_id, suggested_new_leaf_node, rule_id, evidence_terms)
         """
-        for rule in self.leaf_rules:
-            if rule.get("scope") != invoice_side:
-                continue
-            if not re.search(rule["if_text_matches"], text):
+        text_lower = None
+        for rule in self.side_leaf_rules.get(invoice_side, ()):
+            if not rule.test.search(text):
                 continue
 
-            rule_id = rule["id"]
-            evidence = [m.group(0) for m in re.finditer(rule["if_text_matches"], text, flags=re.IGNORECASE)]
+            rule_id = rule.rule_id
+            evidence = [m.group(0) for m in rule.evidence.finditer(text)]
             # decide parent
-            parent = rule.get("default_parent") or rule.get("then_assign_parent")
-            cand = rule.get("then_assign_parent_candidates")
-            if cand:
+            parent = rule.parent
+            if rule.candidates:
+                if text_lower is None:
+                    text_lower = text.lower()
                 chosen = None
-                for c in cand:
-                    if any(k.lower() in text.lower() for k in c.get("if_contains_any", [])):
-                        chosen = c["parent"]
+                for cand_parent, keywords in rule.candidates:
+                    if any(k in text_lower for k in keywords):
+                        chosen = cand_parent
                         break
                 parent = chosen or parent
 
-            # create leaf id key (very conservative: do not include dates)
-            key = re.sub(r"(?i)\b(periode|period|jan|feb|mar|apr|mei|jun|jul|aug|agu|sep|oct|okt|nov|dec|des)\b", " ", text)
-            key = re.sub(r"\b20\d{2}\b|\b\d{1,2}/\d{1,2}/\d{2,4}\b|\b\d{1,2}-\d{1,2}-\d{2,4}\b", " ", key)
-            key = re.sub(r"[^0-9A-Za-z]+", "_", key).strip("_")
-            key = "_".join([t for t in key.split("_") if len(t) > 2][:6]) or "GENERIC"
+            key = _leaf_key(text)
             leaf_id = f"{'REV' if invoice_side=='output' else 'COST'}_AUTO_{rule_id}_{key}".upper()[:80]
 
             suggested = {
@@ -145,6 +248,30 @@ class InvoiceLabeler:
             return parent, suggested, rule_id, list(dict.fromkeys([e.strip() for e in evidence if e.strip()]))[:8]
         return None, None, None, []
 
+    def label_cached(self, text: str, invoice_side: str) -> LabelResult:
+        """
+        label_one() on normalize_text(text), memoized in a bounded LRU.
+        Each call gets its own copy of the result.
+        """
+        key = (normalize_text(text), invoice_side)
+        res = self._cache.get(key)
+        if res is not None:
+            self._cache.move_to_end(key)
+            self.cache_stats["hits"] += 1
+        else:
+            res = self.label_one(key[0], invoice_side)
+            self.cache_stats["misses"] += 1
+            if self.cache_size > 0:
+                self._cache[key] = res
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+                    self.cache_stats["evictions"] += 1
+        return _copy_result(res)
+
+    def cache_info(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters and current size of the label cache"""
+        return {**self.cache_stats, "size": len(self._cache), "max_size": self.cache_size}
+
     def label_one(self, text: str, invoice_side: str) -> LabelResult:
         best, evidence, score = self._match_best_existing_leaf(text, invoice_side)
 
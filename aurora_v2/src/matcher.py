@@ -0,0 +1,209 @@
+from __future__ import annotations
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:  # Python 3.11+
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:  # pragma: no cover
+    import sre_parse, sre_constants
+
+_LITERAL = sre_constants.LITERAL
+_SUBPATTERN = sre_constants.SUBPATTERN
+_REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+# Flags that do not change what a plain literal matches
+_LITERAL_SAFE_FLAGS = re.IGNORECASE | re.UNICODE | re.MULTILINE | re.DOTALL | re.VERBOSE
+
+
+@lru_cache(maxsize=1)
+def _fold_table() -> Dict[int, str]:
+    """
+    str.translate table folding text onto ASCII-lowercase letters the way re
+    compares an ASCII letter under IGNORECASE, one character for one.
+
+    Besides A-Z this is a handful of characters (e.g. U+212A KELVIN SIGN
+    matches 'k'); derived from re itself so it follows the running Python.
+    No character outside the BMP case-folds to ASCII.
+    """
+    table = {cp: chr(cp + 32) for cp in range(ord("A"), ord("Z") + 1)}
+    any_letter = re.compile("[a-z]", re.IGNORECASE)
+    for cp in range(0x80, 0x10000):
+        ch = chr(cp)
+        if any_letter.fullmatch(ch):
+            for letter in "abcdefghijklmnopqrstuvwxyz":
+                if re.fullmatch(letter, ch, re.IGNORECASE):
+                    table[cp] = letter
+                    break
+    return table
+
+
+def fold_case(text: str) -> str:
+    """Lowercase ASCII letters (and their re IGNORECASE equivalents), keeping length"""
+    if text.isascii():
+        return text.lower()
+    return text.translate(_fold_table())
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over plain strings.
+
+    first_matches() scans a text once and reports, for every keyword found,
+    the start of its leftmost occurrence.
+    """
+
+    def __init__(self, keywords: Sequence[str]):
+        self.keywords = list(keywords)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._out: List[List[int]] = [[]]
+        for kid, word in enumerate(self.keywords):
+            state = 0
+            for ch in word:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(kid)
+
+        # Breadth-first failure links; outputs inherit along them
+        self._fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def first_matches(self, text: str) -> Dict[int, int]:
+        """Map keyword index -> start of its leftmost occurrence in text"""
+        goto, fail, out, keywords = self._goto, self._fail, self._out, self.keywords
+        found: Dict[int, int] = {}
+        state = 0
+        for end, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for kid in out[state]:
+                if kid not in found:
+                    found[kid] = end + 1 - len(keywords[kid])
+        return found
+
+
+def _literal_of(pattern: re.Pattern) -> Optional[str]:
+    """The string a pattern matches if it is nothing but literal characters"""
+    if pattern.flags & ~_LITERAL_SAFE_FLAGS:
+        return None
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception:
+        return None
+    chars = []
+    for op, av in parsed:
+        if op is not _LITERAL:
+            return None
+        chars.append(chr(av))
+    return "".join(chars) or None
+
+
+def _required_literals(items, out: List[str]) -> None:
+    """Collect literal runs that every match of the parsed items must contain"""
+    run: List[str] = []
+    for op, av in items:
+        if op is _LITERAL:
+            run.append(chr(av))
+            continue
+        if run:
+            out.append("".join(run))
+            run = []
+        if op is _SUBPATTERN:
+            _group, add_flags, del_flags, body = av
+            if not add_flags and not del_flags:
+                _required_literals(body, out)
+        elif op in _REPEATS:
+            low, _high, body = av
+            if low >= 1:
+                _required_literals(body, out)
+    if run:
+        out.append("".join(run))
+
+
+def _prefilter_of(pattern: re.Pattern) -> Optional[str]:
+    """Longest literal every match must contain (lowercased if case-insensitive)"""
+    if pattern.flags & re.LOCALE:
+        return None
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception:
+        return None
+    literals: List[str] = []
+    _required_literals(parsed, literals)
+    literals = [lit for lit in literals if lit.isascii()]
+    if not literals:
+        return None
+    literal = max(literals, key=len)
+    return literal.lower() if pattern.flags & re.IGNORECASE else literal
+
+
+class MultiPatternMatcher:
+    """
+    Runs a fixed list of compiled patterns against a text in one pass.
+
+    Pure-literal patterns (escaped synonyms, escaped auto-leaf texts) go
+    into two Aho-Corasick automata, one case-insensitive and one exact.
+    Other regexes are only searched when their longest required literal
+    occurs in the text. Case-insensitive lookups run on fold_case(text),
+    which keeps offsets aligned with the original text.
+
+    search_all() returns exactly what pattern.search(text).group(0) gives
+    for each pattern that matches.
+    """
+
+    def __init__(self, patterns: Sequence[re.Pattern]):
+        self.patterns = list(patterns)
+        folded_words: List[str] = []
+        folded_ids: List[int] = []
+        exact_words: List[str] = []
+        exact_ids: List[int] = []
+        # (pattern index, required literal or None, literal is lowercased)
+        self._regexes: List[Tuple[int, Optional[str], bool]] = []
+
+        for pid, pat in enumerate(self.patterns):
+            literal = _literal_of(pat)
+            if literal is not None and literal.isascii():
+                if pat.flags & re.IGNORECASE:
+                    folded_words.append(literal.lower())
+                    folded_ids.append(pid)
+                else:
+                    exact_words.append(literal)
+                    exact_ids.append(pid)
+            else:
+                self._regexes.append((pid, _prefilter_of(pat), bool(pat.flags & re.IGNORECASE)))
+
+        self._folded = (AhoCorasick(folded_words), folded_ids) if folded_words else None
+        self._exact = (AhoCorasick(exact_words), exact_ids) if exact_words else None
+
+    def search_all(self, text: str) -> Dict[int, str]:
+        """Map pattern index -> matched text, for every pattern found in text"""
+        found: Dict[int, str] = {}
+        lowered = fold_case(text)
+        for automaton, source in ((self._folded, lowered), (self._exact, text)):
+            if automaton is None:
+                continue
+            ac, ids = automaton
+            for kid, start in ac.first_matches(source).items():
+                found[ids[kid]] = text[start:start + len(ac.keywords[kid])]
+
+        for pid, literal, folded in self._regexes:
+            if literal is not None and literal not in (lowered if folded else text):
+                continue
+            m = self.patterns[pid].search(text)
+            if m:
+                found[pid] = m.group(0)
+        return found
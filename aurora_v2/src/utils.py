@@ -1,9 +1,108 @@
 from __future__ import annotations
 import re
 from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional, Any
+from datetime import datetime, date, timedelta
+from typing import Dict, Iterator, List, Tuple, Optional, Any
 import pandas as pd
 
+# Cell strings pandas.read_excel treats as missing (its default na_values)
+_NA_STRINGS = frozenset([
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null",
+])
+
+def _header_name(value: Any, idx: int) -> Any:
+    return f"Unnamed: {idx}" if value is None or value == "" else value
+
+def _find_text_column(header: Tuple[Any, ...], text_col: str) -> Optional[int]:
+    # Exact name first, then a case-insensitive match (last one wins, as with
+    # a {lower: name} lookup over pandas' de-duplicated column names)
+    names = [_header_name(v, i) for i, v in enumerate(header)]
+    if text_col in names:
+        return names.index(text_col)
+    seen = set()
+    found = None
+    for i, name in enumerate(names):
+        if name in seen:
+            continue  # pandas would rename this duplicate to "<name>.1"
+        seen.add(name)
+        if isinstance(name, str) and name.lower() == text_col.lower():
+            found = i
+    return found
+
+def _cell_text(value: Any) -> str:
+    """Render one cell the way read_excel(...)[col].astype(str) would"""
+    if value is None:
+        return "nan"
+    if isinstance(value, str):
+        return "nan" if value in _NA_STRINGS else value
+    if isinstance(value, bool):
+        return str(value)
+    if isinstance(value, float):
+        if value != value:
+            return "nan"
+        if value.is_integer():
+            return str(int(value))  # read_excel turns whole floats into ints
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return str(pd.Timestamp(value))
+    if isinstance(value, timedelta):
+        return str(pd.Timedelta(value))
+    return str(value)
+
+def iter_invoice_xlsx(path: str, text_col: str = "nama barang", chunk_size: int = 50_000) -> Iterator[pd.DataFrame]:
+    """
+    Stream the text column of *all sheets* in an XLSX as bounded chunks.
+
+    The workbook is opened once in openpyxl read-only mode; only the text
+    cell of each row is kept. Yields dataframes of at most chunk_size rows
+    with the same columns as read_invoice_xlsx, row_id running across all
+    chunks and sheets. Like read_excel, trailing blank rows of a sheet are
+    dropped and missing cells become "nan". Unlike read_excel, whole
+    numbers in an otherwise numeric column stay "5" rather than "5.0",
+    since a chunk cannot see the dtype of the full column.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    try:
+        row_id = 0
+        for sh in wb.sheetnames:
+            rows = wb[sh].iter_rows(values_only=True)
+            header = next(rows, None)
+            col = _find_text_column(header, text_col) if header else None
+            if col is None:
+                found = [_header_name(v, i) for i, v in enumerate(header or ())]
+                raise ValueError(f"Column '{text_col}' not found in sheet '{sh}'. Found: {found}")
+
+            texts: List[str] = []
+            blank_run = 0  # blank rows held back until a non-blank row follows
+            for values in rows:
+                if all(v is None or v == "" for v in values):
+                    blank_run += 1
+                    continue
+                if blank_run:
+                    texts.extend(["nan"] * blank_run)
+                    blank_run = 0
+                texts.append(_cell_text(values[col]) if col < len(values) else "nan")
+                if len(texts) >= chunk_size:
+                    yield _invoice_frame(texts, sh, row_id)
+                    row_id += len(texts)
+                    texts = []
+            if texts:
+                yield _invoice_frame(texts, sh, row_id)
+                row_id += len(texts)
+    finally:
+        wb.close()
+
+def _invoice_frame(texts: List[str], sheet: str, first_row_id: int) -> pd.DataFrame:
+    out = pd.DataFrame({"invoice_text": texts, "sheet": sheet})
+    out["row_id"] = range(first_row_id, first_row_id + len(texts))
+    # Basic normalization
+    out["invoice_text_norm"] = out["invoice_text"].str.strip()
+    return out
+
 def read_invoice_xlsx(path: str, text_col: str = "nama barang") -> pd.DataFrame:
     """
     Read *all sheets* in an XLSX and return a normalized dataframe with:
@@ -11,27 +110,10 @@ def read_invoice_xlsx(path: str, text_col: str = "nama barang") -> pd.DataFrame:
       - sheet: sheet name
       - row_id: row index within concatenated df
     """
-    xls = pd.ExcelFile(path)
-    frames = []
-    for sh in xls.sheet_names:
-        df = pd.read_excel(path, sheet_name=sh)
-        if text_col not in df.columns:
-            # Try case-insensitive match
-            cols = {c.lower(): c for c in df.columns}
-            if text_col.lower() in cols:
-                df = df.rename(columns={cols[text_col.lower()]: text_col})
-            else:
-                raise ValueError(f"Column '{text_col}' not found in sheet '{sh}'. Found: {list(df.columns)}")
-        out = pd.DataFrame({
-            "invoice_text": df[text_col].astype(str).fillna(""),
-            "sheet": sh
-        })
-        frames.append(out)
-    out_df = pd.concat(frames, ignore_index=True)
-    out_df["row_id"] = out_df.index.astype(int)
-    # Basic normalization
-    out_df["invoice_text_norm"] = out_df["invoice_text"].astype(str).str.strip()
-    return out_df
+    frames = list(iter_invoice_xlsx(path, text_col))
+    if not frames:
+        return pd.DataFrame(columns=["invoice_text", "sheet", "row_id", "invoice_text_norm"])
+    return pd.concat(frames, ignore_index=True)
 
 def normalize_text(s: str) -> str:
     s = (s or "").strip()
@@ -0,0 +1,108 @@
+"""
+Parse-once JSON file cache with mtime revalidation
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Optional
+
+
+def freeze(value: Any) -> Any:
+    """Recursively turn dicts into read-only mappings and lists into tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Inverse of freeze(): plain dicts and lists, e.g. for JSON encoding"""
+    if isinstance(value, MappingProxyType):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+
+@dataclass(frozen=True)
+class JsonSnapshot:
+    """Immutable parsed file contents plus a hash of the raw bytes"""
+    data: Any
+    etag: str
+
+
+class CachedJsonFile:
+    """
+    Parses a JSON file once and re-reads it only when it changes.
+
+    At most every revalidate_seconds the file's mtime and size are checked;
+    if they moved, the file is re-read and re-parsed unless its content hash
+    is unchanged. Callers share one frozen snapshot per file version.
+    """
+
+    def __init__(self, path, revalidate_seconds: float = 2.0):
+        """
+        Args:
+            path: JSON file to load
+            revalidate_seconds: Minimum time between stat() checks
+                                (0 checks on every access)
+        """
+        self.path = Path(path)
+        self.revalidate_seconds = revalidate_seconds
+        self._lock = threading.Lock()
+        self._snapshot: Optional[JsonSnapshot] = None
+        self._stat_key = None
+        self._checked_at = 0.0
+
+    def get(self) -> Any:
+        """Get the frozen parsed contents"""
+        return self.snapshot().data
+
+    def snapshot(self) -> JsonSnapshot:
+        """
+        Get the current snapshot, revalidating it if the interval elapsed.
+
+        Raises:
+            FileNotFoundError: If the file has never been readable
+        """
+        now = time.monotonic()
+        snapshot = self._snapshot
+        if snapshot is not None and now - self._checked_at < self.revalidate_seconds:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is not None and now - self._checked_at < self.revalidate_seconds:
+                return self._snapshot
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                if self._snapshot is None:
+                    raise
+                # Keep serving the last good version while the file is replaced
+                self._checked_at = now
+                return self._snapshot
+
+            stat_key = (stat.st_mtime_ns, stat.st_size)
+            if self._snapshot is None or stat_key != self._stat_key:
+                raw = self.path.read_bytes()
+                etag = hashlib.sha256(raw).hexdigest()
+                if self._snapshot is None or etag != self._snapshot.etag:
+                    try:
+                        data = json.loads(raw)
+                    except ValueError:
+                        if self._snapshot is None:
+                            raise
+                        # Half-written file: keep the last good version, retry later
+                        self._checked_at = now
+                        return self._snapshot
+                    self._snapshot = JsonSnapshot(freeze(data), etag)
+                self._stat_key = stat_key
+            self._checked_at = now
+            return self._snapshot
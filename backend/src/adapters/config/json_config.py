@@ -2,31 +2,42 @@
 JSON config adapter
 """
 
-import json
-from pathlib import Path
-from typing import Dict, Any
+import hashlib
+from typing import Any, Mapping
 from ...application.ports import ConfigPort
 from ...domain.value_objects import TaxObjectLabel
+from .cached_json_file import CachedJsonFile
 
 
 class JsonConfig(ConfigPort):
-    """JSON-based configuration"""
+    """
+    JSON-based configuration.
+
+    Files are parsed once and revalidated by mtime (see CachedJsonFile);
+    getters return read-only snapshots shared between callers.
+    """
 
     def __init__(
         self,
         scoring_path: str = "config/scoring.json",
         priors_path: str = "config/priors.json",
+        revalidate_seconds: float = 2.0,
     ):
-        self.scoring_path = Path(scoring_path)
-        self.priors_path = Path(priors_path)
+        self.scoring_file = CachedJsonFile(scoring_path, revalidate_seconds)
+        self.priors_file = CachedJsonFile(priors_path, revalidate_seconds)
+        self.scoring_path = self.scoring_file.path
+        self.priors_path = self.priors_file.path
 
-    def get_scoring_config(self) -> Dict[str, Any]:
-        with open(self.scoring_path, 'r') as f:
-            return json.load(f)
+    def get_scoring_config(self) -> Mapping[str, Any]:
+        return self.scoring_file.get()
 
-    def get_priors(self) -> Dict[str, Dict[str, float]]:
-        with open(self.priors_path, 'r') as f:
-            return json.load(f)
+    def get_priors(self) -> Mapping[str, Mapping[str, float]]:
+        return self.priors_file.get()
 
     def get_labels(self) -> list[str]:
         return TaxObjectLabel.all_labels()
+
+    def get_etag(self) -> str:
+        """Hash identifying the current contents of both config files"""
+        combined = self.scoring_file.snapshot().etag + self.priors_file.snapshot().etag
+        return hashlib.sha256(combined.encode()).hexdigest()
@@ -0,0 +1,61 @@
+"""
+Build the nearest-example index from the training corpora
+
+Run from backend/:
+    python -m src.adapters.explainability.build_example_index \
+        [--dataset ../aurora_v2/dataset_labeled.csv]
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Iterator, Tuple
+import pandas as pd
+from .nearest_example_index import NearestExampleIndex
+
+
+def iter_seed_corpus(path: Path) -> Iterator[Tuple[str, str, str]]:
+    """Examples from the JSONL seed corpus"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                item = json.loads(line)
+                yield item['text'], item['label'], "seed_corpus"
+
+
+def iter_labeled_dataset(path: Path, chunk_size: int = 100_000) -> Iterator[Tuple[str, str, str]]:
+    """Examples from an aurora_v2 build_dataset.py output (CSV or Parquet)"""
+    columns = ["invoice_text_norm", "primary_label_id"]
+    if path.suffix.lower() == ".parquet":
+        chunks = [pd.read_parquet(path, columns=columns)]
+    else:
+        chunks = pd.read_csv(path, usecols=columns, dtype=str, chunksize=chunk_size)
+    for df in chunks:
+        df = df.dropna()
+        yield from zip(df["invoice_text_norm"], df["primary_label_id"], ["aurora_v2"] * len(df))
+
+
+def build():
+    """Build and save the index"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seed_corpus", default="data/seed_corpus.jsonl")
+    parser.add_argument("--dataset", default=None,
+                        help="Optional aurora_v2 labeled dataset (CSV or Parquet)")
+    parser.add_argument("--out", default="models/nearest_examples.joblib")
+    args = parser.parse_args()
+
+    def examples():
+        yield from iter_seed_corpus(Path(args.seed_corpus))
+        if args.dataset:
+            yield from iter_labeled_dataset(Path(args.dataset))
+
+    index = NearestExampleIndex.build(examples())
+    index.save(args.out)
+
+    print(f"[OK] Index saved to {args.out}")
+    print(f"  Examples: {len(index)}")
+    print(f"  Terms: {index.postings.shape[0]}")
+
+
+if __name__ == "__main__":
+    build()
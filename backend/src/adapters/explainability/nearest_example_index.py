@@ -0,0 +1,171 @@
+"""
+Nearest labeled example index (sparse TF-IDF, inverted-index cosine top-k)
+"""
+
+import hashlib
+import re
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Iterator, Tuple
+import joblib
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+class NearestExampleIndex:
+    """
+    Finds the most similar labeled training examples for account names.
+
+    Examples are stored as L2-normalized TF-IDF rows, transposed into
+    per-term postings (an inverted index). A batch of queries is scored with
+    one sparse product that only walks the postings of terms the queries
+    contain, so cost grows with term overlap rather than corpus size.
+    """
+
+    # Queries scored per sparse product; bounds the size of the score matrix
+    QUERY_BATCH = 2048
+
+    def __init__(
+        self,
+        vectorizer: TfidfVectorizer,
+        postings: sparse.csr_matrix,
+        texts: List[str],
+        labels: List[str],
+        sources: List[str],
+    ):
+        """
+        Args:
+            vectorizer: Fitted TF-IDF vectorizer (L2 norm)
+            postings: (n_terms, n_examples) CSR matrix of example weights
+            texts: Example texts
+            labels: Example labels
+            sources: Corpus each example came from
+        """
+        self.vectorizer = vectorizer
+        self.postings = postings
+        self.texts = texts
+        self.labels = labels
+        self.sources = sources
+        digest = hashlib.sha256()
+        for text, label in zip(texts, labels):
+            digest.update(f"{text}\t{label}\n".encode("utf-8"))
+        self.fingerprint = digest.hexdigest()[:16]
+
+    @classmethod
+    def build(
+        cls,
+        examples: Iterable[Tuple[str, str, str]],
+        max_df: float = 0.5,
+    ) -> "NearestExampleIndex":
+        """
+        Build an index from (text, label, source) examples.
+
+        Examples are de-duplicated on (normalized text, label). Terms in more
+        than max_df of the examples carry little signal and would make every
+        posting walk long, so they are left out of the index.
+        """
+        seen = set()
+        texts, labels, sources = [], [], []
+        for text, label, source in examples:
+            key = (cls._preprocess(text), label)
+            if not key[0] or key in seen:
+                continue
+            seen.add(key)
+            texts.append(text)
+            labels.append(label)
+            sources.append(source)
+        if not texts:
+            raise ValueError("No examples to index")
+
+        vectorizer = TfidfVectorizer(
+            preprocessor=cls._preprocess,
+            ngram_range=(1, 2),
+            sublinear_tf=True,
+            max_df=max_df if len(texts) > 100 else 1.0,
+            dtype=np.float32,
+        )
+        matrix = vectorizer.fit_transform(texts)
+        return cls(vectorizer, matrix.T.tocsr(), texts, labels, sources)
+
+    @classmethod
+    def load(cls, path: str) -> "NearestExampleIndex":
+        """Load an index saved with save()"""
+        state = joblib.load(path)
+        return cls(**state)
+
+    def save(self, path: str) -> None:
+        """Persist the index (joblib, next to the model artifacts)"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump({
+            "vectorizer": self.vectorizer,
+            "postings": self.postings,
+            "texts": self.texts,
+            "labels": self.labels,
+            "sources": self.sources,
+        }, path)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def query(self, texts: List[str], limit: int = 3) -> List[List[Dict[str, Any]]]:
+        """
+        Top-k most similar examples for each text.
+
+        Returns:
+            Per text, up to `limit` dicts with text, label, source and
+            cosine similarity, most similar first
+        """
+        results: List[List[Dict[str, Any]]] = [[] for _ in texts]
+        if not texts or limit <= 0:
+            return results
+
+        for start in range(0, len(texts), self.QUERY_BATCH):
+            queries = self.vectorizer.transform(texts[start:start + self.QUERY_BATCH])
+            scores = (queries @ self.postings).tocsr()
+            for row, example, score in self._top_k(scores, limit):
+                results[start + row].append({
+                    "text": self.texts[example],
+                    "label": self.labels[example],
+                    "source": self.sources[example],
+                    "similarity": round(min(score, 1.0), 4),
+                })
+        return results
+
+    @staticmethod
+    def _top_k(scores: sparse.csr_matrix, k: int) -> Iterator[Tuple[int, int, float]]:
+        """
+        Yield (row, column, score) for the k best positive entries of each
+        row, best first; ties go to the lower column.
+
+        Runs k vectorized passes over the candidates (per-row max, take it,
+        mask it) instead of sorting every candidate.
+        """
+        scores.sort_indices()
+        counts = np.diff(scores.indptr)
+        if not scores.nnz:
+            return
+        rows = np.repeat(np.arange(scores.shape[0]), counts)
+        nonempty = counts > 0
+        starts = scores.indptr[:-1][nonempty]
+        remaining = scores.data.astype(np.float64)
+        best = np.full(scores.shape[0], -np.inf)
+
+        for _ in range(min(k, int(counts.max()))):
+            best[nonempty] = np.maximum.reduceat(remaining, starts)
+            hits = np.flatnonzero((remaining == best[rows]) & (remaining > 0))
+            if not len(hits):
+                return
+            hit_rows = rows[hits]
+            first = hits[np.r_[True, hit_rows[1:] != hit_rows[:-1]]]
+            yield from zip(
+                rows[first].tolist(), scores.indices[first].tolist(), scores.data[first].tolist()
+            )
+            remaining[first] = -1.0
+
+    @staticmethod
+    def _preprocess(text: str) -> str:
+        """Same normalization the classifier applies to account names"""
+        text = text.lower()
+        text = re.sub(r'[^a-z0-9\s]', ' ', text)
+        return re.sub(r'\s+', ' ', text).strip()
+
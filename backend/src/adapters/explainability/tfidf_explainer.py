@@ -2,25 +2,192 @@
 TF-IDF explainability adapter
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional, Sequence
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.pipeline import Pipeline
 from ...application.ports import ExplainabilityPort
+from ..ml.shared_featurizer import SharedTfidfFeaturizer
+from .nearest_example_index import NearestExampleIndex
+
+
+class _LinearHead:
+    """Per-class weight vectors of one TF-IDF + linear pipeline"""
+
+    def __init__(self, pipeline: Pipeline, label_map: Optional[Dict[str, Optional[str]]]):
+        vectorizer = pipeline.steps[0][1]
+        estimator = pipeline.steps[-1][1]
+        self.pipeline = pipeline
+        self.vectorizer = vectorizer
+        self.terms = vectorizer.get_feature_names_out()
+
+        coef = np.asarray(estimator.coef_, dtype=np.float64)
+        classes = [str(c) for c in estimator.classes_]
+        if coef.shape[0] == 1 and len(classes) == 2:
+            # Binary models store one vector, pointing at classes_[1]
+            coef = np.vstack([-coef[0], coef[0]])
+        self.weights = coef
+
+        # System label -> model class indices (several classes may share a label)
+        self.label_classes: Dict[str, List[int]] = {}
+        for idx, cls in enumerate(classes):
+            label = label_map.get(cls) if label_map is not None else cls
+            if label:
+                self.label_classes.setdefault(label, []).append(idx)
+
+    @staticmethod
+    def supports(pipeline: Any) -> bool:
+        """Only vectorizer -> linear model pipelines have per-term contributions"""
+        return (
+            isinstance(pipeline, Pipeline)
+            and len(pipeline.steps) == 2
+            and isinstance(pipeline.steps[0][1], TfidfVectorizer)
+            and hasattr(pipeline.steps[-1][1], "coef_")
+        )
 
 
 class TfidfExplainer(ExplainabilityPort):
-    """TF-IDF-based explainability"""
+    """
+    Explains predictions by per-term contribution to the predicted class.
+
+    A term's contribution is its TF-IDF weight in the text times the
+    predicted class's coefficient for it; the top terms are those pushing
+    hardest toward the prediction. When several model classes map to one
+    label, the class with the highest decision value for the text is used.
+    Labels no model has coefficients for fall back to the text's highest
+    TF-IDF terms.
+
+    Nearest examples come from an optional NearestExampleIndex.
+    """
+
+    # Part of the job scoring fingerprint: bump when explanations change
+    VERSION = "tfidf-coef-v1"
 
-    def __init__(self, model):
+    def __init__(
+        self,
+        model: Any,
+        label_maps: Optional[Sequence[Optional[Dict[str, Optional[str]]]]] = None,
+        preprocess: Optional[Callable[[str], str]] = None,
+        example_index: Optional[NearestExampleIndex] = None,
+    ):
+        """
+        Args:
+            model: A fitted TF-IDF + linear pipeline, or a list of them
+            label_maps: Per pipeline, {model class: system label}; a None
+                        label drops the class. Classes keep their own name
+                        when omitted.
+            preprocess: Text normalization applied before the vectorizer,
+                        matching what the classifier feeds its pipelines
+            example_index: Labeled examples for get_nearest_examples
+        """
+        pipelines = list(model) if isinstance(model, (list, tuple)) else [model]
+        label_maps = list(label_maps) if label_maps is not None else [None] * len(pipelines)
         self.model = model
+        self.preprocess = preprocess
+        self.example_index = example_index
+        self.version = (
+            f"{self.VERSION}+{example_index.fingerprint}" if example_index is not None
+            else self.VERSION
+        )
+        self.heads = [
+            _LinearHead(pipeline, label_map)
+            for pipeline, label_map in zip(pipelines, label_maps)
+            if _LinearHead.supports(pipeline)
+        ]
+        # Tokenize once for all heads when their vectorizers allow it
+        self.featurizer = (
+            SharedTfidfFeaturizer.from_pipelines([h.pipeline for h in self.heads])
+            if len(self.heads) > 1 else None
+        )
 
     def get_top_terms(self, text: str, label: str, limit: int = 5) -> List[str]:
-        """Get top terms (simplified)"""
-        # This is a simplified version
-        # Full implementation would extract feature importance from TF-IDF
-        terms = text.lower().split()
-        return terms[:limit]
+        """Get top contributing terms for one prediction"""
+        return self.get_top_terms_batch([text], [label], limit)[0]
+
+    def get_top_terms_batch(
+        self, texts: List[str], labels: List[str], limit: int = 5
+    ) -> List[List[str]]:
+        """
+        Get top contributing terms for many predictions at once.
+
+        Each text is vectorized once; contributions are computed over the
+        non-zero entries of the sparse matrices in bulk.
+        """
+        results: List[List[str]] = [[] for _ in texts]
+        if not texts or not self.heads:
+            return results
+
+        if self.preprocess is not None:
+            texts = [self.preprocess(t) for t in texts]
+        if self.featurizer is not None:
+            matrices = self.featurizer.transform(texts)
+        else:
+            matrices = [head.vectorizer.transform(texts) for head in self.heads]
+
+        label_names, label_codes = np.unique(np.asarray(labels, dtype=object), return_inverse=True)
+        unexplained = np.ones(len(texts), dtype=bool)
+        for head, matrix in zip(self.heads, matrices):
+            # Class whose weights explain each row (-1: label unknown to this head)
+            chosen = np.full(len(texts), -1, dtype=np.intp)
+            decision = None
+            for code, label in enumerate(label_names.tolist()):
+                classes = head.label_classes.get(label)
+                if not classes:
+                    continue
+                rows = np.flatnonzero((label_codes == code) & unexplained)
+                if not len(rows):
+                    continue
+                if len(classes) == 1:
+                    chosen[rows] = classes[0]
+                else:
+                    if decision is None:
+                        decision = np.asarray(matrix @ head.weights.T)
+                    best = decision[np.ix_(rows, classes)].argmax(axis=1)
+                    chosen[rows] = np.asarray(classes)[best]
+            if (chosen >= 0).any():
+                self._rank_terms(matrix, head, chosen, limit, results)
+                unexplained &= chosen < 0
+
+        # No coefficients for these labels: most heavily weighted terms instead
+        if unexplained.any():
+            head, matrix = self.heads[0], matrices[0]
+            self._rank_terms(matrix, head, np.where(unexplained, 0, -1), limit, results, weighted=False)
+        return results
+
+    @staticmethod
+    def _rank_terms(
+        matrix, head: _LinearHead, chosen: np.ndarray, limit: int,
+        results: List[List[str]], weighted: bool = True,
+    ) -> None:
+        """Append each chosen row's top positive terms to results"""
+        matrix = matrix.tocsr()
+        rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+        columns = matrix.indices
+        scores = matrix.data.astype(np.float64)
+        if weighted:
+            scores = scores * head.weights[np.maximum(chosen[rows], 0), columns]
+
+        keep = (chosen[rows] >= 0) & (scores > 0)
+        rows, columns, scores = rows[keep], columns[keep], scores[keep]
+        order = np.lexsort((-scores, rows))
+        rows, columns = rows[order], columns[order]
+
+        # Rank of each entry within its row; keep the first `limit`
+        rank = np.arange(len(rows)) - np.searchsorted(rows, rows, side="left")
+        top = rank < limit
+        for row, column in zip(rows[top].tolist(), columns[top].tolist()):
+            results[row].append(str(head.terms[column]))
 
     def get_nearest_examples(
         self, text: str, limit: int = 3
     ) -> List[Dict[str, Any]]:
-        """Get nearest examples (simplified)"""
-        return []
+        """Get nearest labeled examples (empty without an index)"""
+        return self.get_nearest_examples_batch([text], limit)[0]
+
+    def get_nearest_examples_batch(
+        self, texts: List[str], limit: int = 3
+    ) -> List[List[Dict[str, Any]]]:
+        """Get nearest labeled examples for many texts in one index query"""
+        if self.example_index is None:
+            return [[] for _ in texts]
+        return self.example_index.query(texts, limit)
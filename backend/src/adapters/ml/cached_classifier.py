@@ -0,0 +1,268 @@
+"""
+Content-addressed prediction cache layered around a ClassifierPort
+"""
+
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
+import numpy as np
+from ...application.ports import ClassifierPort
+from ..persistence.sqlite_database import connect
+
+logger = logging.getLogger(__name__)
+
+
+class CachedClassifier(ClassifierPort):
+    """
+    Caches probability rows keyed by (model version, normalized text).
+
+    Each call dedupes its texts, serves what it can from a bounded in-memory
+    LRU tier, then from an optional SQLite tier that survives restarts, and
+    only sends the remaining unique texts to the wrapped classifier.
+    """
+
+    # SQLite's default limit on bound parameters is 999
+    _SQL_BATCH = 900
+
+    def __init__(
+        self,
+        classifier: ClassifierPort,
+        max_entries: int = 100_000,
+        disk_path: Optional[str] = None,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            classifier: Classifier to delegate cache misses to
+            max_entries: Capacity of the in-memory LRU tier
+            disk_path: SQLite file for the persistent tier (None disables it)
+        """
+        self.classifier = classifier
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._labels: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        self._disk: Optional[sqlite3.Connection] = None
+        if disk_path:
+            # WAL plus a busy timeout: worker processes share the file
+            self._disk = connect(disk_path)
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS prediction_cache ("
+                " model_version TEXT NOT NULL,"
+                " text TEXT NOT NULL,"
+                " probabilities BLOB NOT NULL,"
+                " PRIMARY KEY (model_version, text))"
+            )
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS prediction_cache_labels ("
+                " model_version TEXT PRIMARY KEY,"
+                " labels TEXT NOT NULL)"
+            )
+            self._disk.commit()
+            for version, labels in self._disk.execute(
+                "SELECT model_version, labels FROM prediction_cache_labels"
+            ):
+                self._labels[version] = labels.split("\t")
+
+    def predict_proba(self, texts: List[str]) -> List[Dict[str, float]]:
+        """Predict probabilities"""
+        return self.matrix_to_dicts(*self.predict_matrix(texts))
+
+    def predict_matrix(self, texts: List[str]) -> Tuple[np.ndarray, List[str]]:
+        """
+        Predict probabilities, scoring each unique uncached text once.
+
+        Args:
+            texts: List of account names
+
+        Returns:
+            Tuple of (float32 probability matrix, labels)
+        """
+        if not texts:
+            return self.classifier.predict_matrix(texts)
+
+        version = self.classifier.get_version()
+
+        # Dedupe on the normalized text; keep one original per key to score
+        unique: Dict[str, int] = {}
+        representatives: List[str] = []
+        inverse = np.empty(len(texts), dtype=np.intp)
+        for i, text in enumerate(texts):
+            key = self.classifier.normalize(text)
+            idx = unique.get(key)
+            if idx is None:
+                idx = unique[key] = len(representatives)
+                representatives.append(text)
+            inverse[i] = idx
+        keys = list(unique)
+
+        found: Dict[int, np.ndarray] = {}
+        with self._lock:
+            for idx, key in enumerate(keys):
+                row = self._memory.get((version, key))
+                if row is not None:
+                    self._memory.move_to_end((version, key))
+                    found[idx] = row
+            self._stats["memory_hits"] += len(found)
+
+        missing = [idx for idx in range(len(keys)) if idx not in found]
+        if missing and self._disk is not None and self._stored_labels(version) is not None:
+            disk_rows = self._disk_get(version, [keys[idx] for idx in missing])
+            for idx in missing:
+                row = disk_rows.get(keys[idx])
+                if row is not None:
+                    found[idx] = row
+            with self._lock:
+                self._stats["disk_hits"] += len(disk_rows)
+            self._remember(version, {keys[idx]: found[idx] for idx in missing if idx in found})
+            missing = [idx for idx in missing if idx not in found]
+
+        labels = self._labels.get(version)
+        if missing:
+            scored, labels = self.classifier.predict_matrix(
+                [representatives[idx] for idx in missing]
+            )
+            if self._labels.get(version) != labels and self._set_labels(version, labels):
+                # Vocabulary changed: stale rows were dropped; rescore
+                # anything served from them
+                if found:
+                    found = {}
+                    missing = list(range(len(keys)))
+                    scored, labels = self.classifier.predict_matrix(representatives)
+            new_rows = {}
+            for idx, row in zip(missing, scored):
+                found[idx] = new_rows[keys[idx]] = row.copy()
+            with self._lock:
+                self._stats["misses"] += len(missing)
+            self._remember(version, new_rows)
+            if self._disk is not None:
+                self._disk_put(version, new_rows)
+
+        matrix = np.empty((len(keys), len(labels)), dtype=np.float32)
+        for idx, row in found.items():
+            matrix[idx] = row
+
+        logger.debug(
+            "Prediction cache: %d texts, %d unique, %d scored",
+            len(texts), len(keys), len(missing)
+        )
+        return matrix[inverse], list(labels)
+
+    def get_version(self) -> str:
+        return self.classifier.get_version()
+
+    def normalize(self, text: str) -> str:
+        return self.classifier.normalize(text)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get hit/miss counters and current tier sizes"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        stats["hits"] = stats["memory_hits"] + stats["disk_hits"]
+        return stats
+
+    def clear(self) -> None:
+        """Drop both cache tiers"""
+        with self._lock:
+            self._memory.clear()
+            self._labels.clear()
+            if self._disk is not None:
+                self._disk.execute("DELETE FROM prediction_cache")
+                self._disk.execute("DELETE FROM prediction_cache_labels")
+                self._disk.commit()
+
+    def _remember(self, version: str, rows: Dict[str, np.ndarray]) -> None:
+        """Insert rows into the LRU tier, evicting the oldest beyond capacity"""
+        with self._lock:
+            for key, row in rows.items():
+                self._memory[(version, key)] = row
+                self._memory.move_to_end((version, key))
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _stored_labels(self, version: str) -> Optional[List[str]]:
+        """
+        Label vocabulary of a version, picking up one recorded on disk by
+        another process since this one started.
+        """
+        labels = self._labels.get(version)
+        if labels is None and self._disk is not None:
+            with self._lock:
+                row = self._disk.execute(
+                    "SELECT labels FROM prediction_cache_labels WHERE model_version = ?",
+                    (version,)
+                ).fetchone()
+                if row is not None:
+                    labels = self._labels[version] = row[0].split("\t")
+        return labels
+
+    def _set_labels(self, version: str, labels: List[str]) -> bool:
+        """
+        Record the model's label vocabulary for a version.
+
+        The vocabulary stored on disk is re-read in the same transaction:
+        other processes sharing the file may have recorded it (and cached
+        rows under it) already. Rows are only dropped when the stored
+        vocabulary really differs. Returns True if cached rows were dropped.
+        """
+        labels = list(labels)
+        with self._lock:
+            changed = version in self._labels
+            if self._disk is not None:
+                self._disk.execute("BEGIN IMMEDIATE")
+                try:
+                    row = self._disk.execute(
+                        "SELECT labels FROM prediction_cache_labels WHERE model_version = ?",
+                        (version,)
+                    ).fetchone()
+                    stored = row[0].split("\t") if row is not None else None
+                    if stored != labels:
+                        changed = changed or stored is not None
+                        self._disk.execute(
+                            "DELETE FROM prediction_cache WHERE model_version = ?", (version,)
+                        )
+                        self._disk.execute(
+                            "INSERT OR REPLACE INTO prediction_cache_labels VALUES (?, ?)",
+                            (version, "\t".join(labels))
+                        )
+                    self._disk.commit()
+                except BaseException:
+                    self._disk.rollback()
+                    raise
+            if changed:
+                for key in [k for k in self._memory if k[0] == version]:
+                    del self._memory[key]
+            self._labels[version] = labels
+        return changed
+
+    def _disk_get(self, version: str, keys: List[str]) -> Dict[str, np.ndarray]:
+        rows = {}
+        with self._lock:
+            for start in range(0, len(keys), self._SQL_BATCH):
+                batch = keys[start:start + self._SQL_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                for text, blob in self._disk.execute(
+                    f"SELECT text, probabilities FROM prediction_cache "
+                    f"WHERE model_version = ? AND text IN ({placeholders})",
+                    (version, *batch)
+                ):
+                    rows[text] = np.frombuffer(blob, dtype=np.float32)
+        return rows
+
+    def _disk_put(self, version: str, rows: Dict[str, np.ndarray]) -> None:
+        with self._lock:
+            self._disk.executemany(
+                "INSERT OR REPLACE INTO prediction_cache VALUES (?, ?, ?)",
+                (
+                    (version, key, np.asarray(row, dtype=np.float32).tobytes())
+                    for key, row in rows.items()
+                )
+            )
+            self._disk.commit()
@@ -0,0 +1,130 @@
+"""
+Shared TF-IDF featurization for pipelines that tokenize the same way
+"""
+
+from typing import List, Optional, Sequence
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.pipeline import Pipeline
+
+
+# Vectorizer parameters that decide how raw text becomes term counts.
+# Pipelines agreeing on all of these can share one tokenization pass.
+ANALYZER_PARAMS = (
+    "input", "encoding", "decode_error", "strip_accents", "lowercase",
+    "preprocessor", "tokenizer", "analyzer", "stop_words", "token_pattern",
+    "ngram_range", "binary",
+)
+
+
+class SharedTfidfFeaturizer:
+    """
+    Tokenizes texts once for several TF-IDF + linear pipelines.
+
+    Texts are counted against the union of all vocabularies in one pass.
+    Each pipeline then gets its own columns of that count matrix, weighted
+    by its own fitted idf / sublinear_tf / norm settings, so the resulting
+    matrices are identical to what each pipeline would build on its own.
+    When all pipelines share an identical vectorizer the TF-IDF matrix
+    itself is built once and reused.
+    """
+
+    def __init__(self, pipelines: Sequence[Pipeline]):
+        """
+        Args:
+            pipelines: Fitted pipelines whose first step is a TfidfVectorizer
+                       with mutually compatible analyzer settings
+        """
+        self.pipelines = list(pipelines)
+        self.vectorizers: List[TfidfVectorizer] = [p.steps[0][1] for p in self.pipelines]
+        # Remaining steps (the linear heads) consume the TF-IDF matrix directly
+        self.heads: List[Pipeline] = [p[1:] for p in self.pipelines]
+
+        first = self.vectorizers[0]
+        self._identical = all(
+            self._same_weighting(first, v) and v.vocabulary_ == first.vocabulary_
+            for v in self.vectorizers[1:]
+        )
+
+        if self._identical:
+            self._counter = None
+            self._columns = None
+        else:
+            union = {}
+            for v in self.vectorizers:
+                for term in v.vocabulary_:
+                    union.setdefault(term, len(union))
+            params = {name: getattr(first, name) for name in ANALYZER_PARAMS}
+            self._counter = CountVectorizer(vocabulary=union, dtype=first.dtype, **params)
+            self._columns = []
+            for v in self.vectorizers:
+                columns = np.empty(len(v.vocabulary_), dtype=np.intp)
+                for term, idx in v.vocabulary_.items():
+                    columns[idx] = union[term]
+                self._columns.append(columns)
+
+    @classmethod
+    def from_pipelines(cls, pipelines: Sequence[Pipeline]) -> Optional["SharedTfidfFeaturizer"]:
+        """Build a featurizer, or return None if the pipelines cannot share one"""
+        if not cls.is_compatible(pipelines):
+            return None
+        return cls(pipelines)
+
+    @staticmethod
+    def is_compatible(pipelines: Sequence[Pipeline]) -> bool:
+        """Check that every pipeline starts with an equivalently-tokenizing TfidfVectorizer"""
+        vectorizers = []
+        for p in pipelines:
+            if not isinstance(p, Pipeline) or len(p.steps) < 2:
+                return False
+            vectorizer = p.steps[0][1]
+            if not isinstance(vectorizer, TfidfVectorizer) or not hasattr(vectorizer, "vocabulary_"):
+                return False
+            vectorizers.append(vectorizer)
+
+        if not vectorizers:
+            return False
+
+        first = vectorizers[0]
+        return all(
+            getattr(v, name) == getattr(first, name)
+            for v in vectorizers[1:]
+            for name in ANALYZER_PARAMS + ("dtype",)
+        )
+
+    @staticmethod
+    def _same_weighting(a: TfidfVectorizer, b: TfidfVectorizer) -> bool:
+        """Check that two vectorizers weight counts identically"""
+        if (a.norm, a.use_idf, a.smooth_idf, a.sublinear_tf) != (b.norm, b.use_idf, b.smooth_idf, b.sublinear_tf):
+            return False
+        if a.use_idf:
+            return np.array_equal(a.idf_, b.idf_)
+        return True
+
+    def transform(self, texts: List[str]) -> List[sparse.csr_matrix]:
+        """
+        Featurize texts for every pipeline.
+
+        Args:
+            texts: Preprocessed texts
+
+        Returns:
+            One TF-IDF matrix per pipeline, in pipeline order
+        """
+        if self._identical:
+            matrix = self.vectorizers[0].transform(texts)
+            return [matrix] * len(self.vectorizers)
+
+        counts = self._counter.transform(texts)
+        return [
+            v._tfidf.transform(counts[:, columns], copy=False)
+            for v, columns in zip(self.vectorizers, self._columns)
+        ]
+
+    def predict_proba(self, texts: List[str]) -> List[np.ndarray]:
+        """Featurize once and return each pipeline's class probabilities"""
+        return [
+            head.predict_proba(matrix)
+            for head, matrix in zip(self.heads, self.transform(texts))
+        ]
@@ -4,8 +4,9 @@ TF-IDF + Logistic Regression Classifier
 
 import joblib
 import json
+import numpy as np
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.pipeline import Pipeline
@@ -26,27 +27,32 @@ class TfidfClassifier(ClassifierPort):
 
     def predict_proba(self, texts: List[str]) -> List[Dict[str, float]]:
         """Predict probabilities"""
+        return self.matrix_to_dicts(*self.predict_matrix(texts))
+
+    def predict_matrix(self, texts: List[str]) -> Tuple[np.ndarray, List[str]]:
+        """Predict probabilities as a (n_texts, n_labels) matrix"""
         if not self.model:
             raise ValueError("Model not trained")
 
+        labels = [str(label) for label in self.model.classes_]
+        if not texts:
+            return np.zeros((0, len(labels)), dtype=np.float32), labels
+
         # Preprocess
         preprocessed = [self._preprocess(text) for text in texts]
 
         # Predict
         proba = self.model.predict_proba(preprocessed)
-        labels = self.model.classes_
 
-        # Convert to list of dicts
-        results = []
-        for prob_array in proba:
-            prob_dict = {label: float(prob) for label, prob in zip(labels, prob_array)}
-            results.append(prob_dict)
-
-        return results
+        return proba.astype(np.float32), labels
 
     def get_version(self) -> str:
         return self.version
 
+    def normalize(self, text: str) -> str:
+        """Normalize text the way the model sees it"""
+        return self._preprocess(text)
+
     @staticmethod
     def _preprocess(text: str) -> str:
         """Preprocess Indonesian text"""
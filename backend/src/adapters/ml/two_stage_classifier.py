@@ -2,11 +2,15 @@
 Two-Stage Classifier using separate models for Fiscal Correction and Tax Object Classification
 """
 
+import hashlib
+import io
 import joblib
+import numpy as np
 from pathlib import Path
-from typing import List, Dict
+from typing import Any, List, Dict, Optional, Tuple
 import re
 from ...application.ports import ClassifierPort
+from .shared_featurizer import SharedTfidfFeaturizer
 
 
 class TwoStageClassifier(ClassifierPort):
@@ -48,10 +52,17 @@ class TwoStageClassifier(ClassifierPort):
         "Non_Object"
     ]
 
+    # Probability mass given to PPN when neither model can predict it
+    PPN_FLOOR = 0.01
+
+    # Code-side version; the model artifacts' digest is appended to it
+    BASE_VERSION = "two-stage-v1.0"
+
     def __init__(
         self,
         fiscal_model_path: str = "models/koreksi_fiskal_lr.joblib",
-        tax_object_model_path: str = "models/objek_pph_lr.joblib"
+        tax_object_model_path: str = "models/objek_pph_lr.joblib",
+        shared_featurization: bool = True
     ):
         """
         Initialize two-stage classifier.
@@ -59,24 +70,55 @@ class TwoStageClassifier(ClassifierPort):
         Args:
             fiscal_model_path: Path to fiscal correction model
             tax_object_model_path: Path to tax object classification model
+            shared_featurization: Tokenize texts once for both models when
+                their TF-IDF vectorizers are compatible
         """
         self.fiscal_model_path = Path(fiscal_model_path)
         self.tax_object_model_path = Path(tax_object_model_path)
         self.fiscal_model = None
         self.tax_object_model = None
-        self.version = "two-stage-v1.0"
 
         # Load models
         if self.fiscal_model_path.exists():
-            self.fiscal_model = joblib.load(self.fiscal_model_path)
+            self.fiscal_model, fiscal_digest = self._load_artifact(self.fiscal_model_path)
         else:
             raise FileNotFoundError(f"Fiscal correction model not found: {self.fiscal_model_path}")
 
         if self.tax_object_model_path.exists():
-            self.tax_object_model = joblib.load(self.tax_object_model_path)
+            self.tax_object_model, tax_object_digest = self._load_artifact(self.tax_object_model_path)
         else:
             raise FileNotFoundError(f"Tax object model not found: {self.tax_object_model_path}")
 
+        # Retrained or replaced artifacts get a new version, which keys the
+        # prediction cache and job result reuse
+        combined = hashlib.sha256(f"{fiscal_digest}:{tax_object_digest}".encode()).hexdigest()
+        self.version = f"{self.BASE_VERSION}+{combined[:16]}"
+
+        # Precompute class index -> ALL_LABELS column projections
+        self._fiscal_projection = self._build_projection(
+            self.fiscal_model.classes_, self.FISCAL_CORRECTION_MAP
+        )
+        self._tax_object_projection = self._build_projection(
+            self.tax_object_model.classes_, self.TAX_OBJECT_MAP
+        )
+        self._floor = self._build_floor()
+
+        # Single-pass featurization (None if the pipelines tokenize differently)
+        self.featurizer = None
+        if shared_featurization:
+            self.featurizer = SharedTfidfFeaturizer.from_pipelines(
+                [self.fiscal_model, self.tax_object_model]
+            )
+
+    @staticmethod
+    def _load_artifact(path: Path) -> Tuple[Any, str]:
+        """
+        Load a joblib model and the sha256 of its file. The bytes are read
+        once, so the digest always describes the model that was loaded.
+        """
+        raw = path.read_bytes()
+        return joblib.load(io.BytesIO(raw)), hashlib.sha256(raw).hexdigest()
+
     def predict_proba(self, texts: List[str]) -> List[Dict[str, float]]:
         """
         Predict probabilities using two-stage approach.
@@ -87,93 +129,107 @@ class TwoStageClassifier(ClassifierPort):
         Returns:
             List of {label: probability} dictionaries with unified labels
         """
+        return self.matrix_to_dicts(*self.predict_matrix(texts))
+
+    def predict_matrix(self, texts: List[str]) -> Tuple[np.ndarray, List[str]]:
+        """
+        Predict the unified probability matrix.
+
+        Args:
+            texts: List of account names
+
+        Returns:
+            Tuple of (float32 array of shape (len(texts), len(ALL_LABELS)), ALL_LABELS)
+        """
         if not self.fiscal_model or not self.tax_object_model:
             raise ValueError("Models not loaded")
 
+        labels = list(self.ALL_LABELS)
+        if not texts:
+            return np.zeros((0, len(labels)), dtype=np.float32), labels
+
         # Preprocess all texts
         preprocessed = [self._preprocess(text) for text in texts]
 
-        # Stage 1: Predict fiscal corrections
-        fiscal_proba = self.fiscal_model.predict_proba(preprocessed)
-        fiscal_labels = self.fiscal_model.classes_
-
-        # Stage 2: Predict tax objects
-        tax_object_proba = self.tax_object_model.predict_proba(preprocessed)
-        tax_object_labels = self.tax_object_model.classes_
-
-        # Combine results
-        results = []
-        for i in range(len(texts)):
-            combined_probs = self._combine_predictions(
-                fiscal_proba[i],
-                fiscal_labels,
-                tax_object_proba[i],
-                tax_object_labels
-            )
-            results.append(combined_probs)
+        if self.featurizer is not None:
+            # Both stages from one shared TF-IDF pass
+            fiscal_proba, tax_object_proba = self.featurizer.predict_proba(preprocessed)
+        else:
+            # Stage 1: Predict fiscal corrections
+            fiscal_proba = self.fiscal_model.predict_proba(preprocessed)
 
-        return results
+            # Stage 2: Predict tax objects
+            tax_object_proba = self.tax_object_model.predict_proba(preprocessed)
+
+        combined = self._combine_predictions(fiscal_proba, tax_object_proba)
+        return combined.astype(np.float32), labels
 
     def _combine_predictions(
         self,
-        fiscal_probs: list,
-        fiscal_labels: list,
-        tax_object_probs: list,
-        tax_object_labels: list
-    ) -> Dict[str, float]:
+        fiscal_proba: np.ndarray,
+        tax_object_proba: np.ndarray
+    ) -> np.ndarray:
         """
-        Combine predictions from both models into unified probability distribution.
+        Combine predictions from both models into unified probability distributions.
 
         Strategy:
-        1. Map fiscal correction probabilities to system labels
-        2. Map tax object probabilities to system labels
-        3. Normalize to ensure probabilities sum to 1.0
-        4. Handle special cases (e.g., PPN which may not be in either model)
+        1. Project fiscal correction probabilities onto system labels
+        2. Project tax object probabilities onto system labels (PPh4_2_Final
+           variations are summed by the projection)
+        3. Add the PPN floor, since PPN is not in either model
+        4. Normalize each row to sum to 1.0
 
         Args:
-            fiscal_probs: Probabilities from fiscal correction model
-            fiscal_labels: Labels from fiscal correction model
-            tax_object_probs: Probabilities from tax object model
-            tax_object_labels: Labels from tax object model
+            fiscal_proba: (n_rows, n_fiscal_classes) probabilities
+            tax_object_proba: (n_rows, n_tax_object_classes) probabilities
 
         Returns:
-            Dictionary of {system_label: probability}
+            (n_rows, len(ALL_LABELS)) array of probabilities
         """
-        combined = {}
-
-        # Process fiscal correction predictions
-        for prob, label in zip(fiscal_probs, fiscal_labels):
-            mapped_label = self.FISCAL_CORRECTION_MAP.get(label)
-            if mapped_label:  # Only add if there's a mapping (skip "Tidak ada koreksi fiskal")
-                combined[mapped_label] = combined.get(mapped_label, 0.0) + float(prob)
-
-        # Process tax object predictions
-        for prob, label in zip(tax_object_probs, tax_object_labels):
-            mapped_label = self.TAX_OBJECT_MAP.get(label)
-            if mapped_label:
-                # For PPh4_2_Final, sum all variations
-                combined[mapped_label] = combined.get(mapped_label, 0.0) + float(prob)
+        combined = fiscal_proba @ self._fiscal_projection
+        combined += tax_object_proba @ self._tax_object_projection
+        combined += self._floor
 
-        # Add small probability for PPN if not present (not in either model)
-        if 'PPN' not in combined:
-            combined['PPN'] = 0.01
+        # Normalize probabilities to sum to 1.0 (rows summing to 0 stay 0)
+        totals = combined.sum(axis=1, keepdims=True)
+        np.divide(combined, totals, out=combined, where=totals > 0)
 
-        # Normalize probabilities to sum to 1.0
-        total = sum(combined.values())
-        if total > 0:
-            combined = {label: prob / total for label, prob in combined.items()}
+        return combined
 
-        # Ensure all system labels are present (with 0 probability if not predicted)
-        for label in self.ALL_LABELS:
-            if label not in combined:
-                combined[label] = 0.0
+    def _build_projection(
+        self,
+        classes: np.ndarray,
+        label_map: Dict[str, Optional[str]]
+    ) -> np.ndarray:
+        """
+        Build a (n_classes, len(ALL_LABELS)) 0/1 matrix mapping model classes
+        to system labels. Unmapped classes (e.g. "Tidak ada koreksi fiskal")
+        get an all-zero row.
+        """
+        column = {label: i for i, label in enumerate(self.ALL_LABELS)}
+        projection = np.zeros((len(classes), len(self.ALL_LABELS)), dtype=np.float64)
+        for i, label in enumerate(classes):
+            mapped_label = label_map.get(label)
+            if mapped_label:
+                projection[i, column[mapped_label]] = 1.0
+        return projection
 
-        return combined
+    def _build_floor(self) -> np.ndarray:
+        """Build the constant per-row offset (PPN floor when PPN is unmapped)"""
+        floor = np.zeros(len(self.ALL_LABELS), dtype=np.float64)
+        ppn = self.ALL_LABELS.index('PPN')
+        if not self._fiscal_projection[:, ppn].any() and not self._tax_object_projection[:, ppn].any():
+            floor[ppn] = self.PPN_FLOOR
+        return floor
 
     def get_version(self) -> str:
         """Get model version"""
         return self.version
 
+    def normalize(self, text: str) -> str:
+        """Normalize text the way the model sees it"""
+        return self._preprocess(text)
+
     @staticmethod
     def _preprocess(text: str) -> str:
         """
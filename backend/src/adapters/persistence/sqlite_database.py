@@ -0,0 +1,22 @@
+"""
+Shared SQLite connection setup for persistence adapters
+"""
+
+import sqlite3
+from pathlib import Path
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """
+    Open a connection configured for concurrent API + worker access.
+
+    WAL lets readers proceed while a writer commits, and the busy timeout
+    makes competing writers wait instead of failing immediately.
+    """
+    if db_path != ":memory:":
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30.0, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    return conn
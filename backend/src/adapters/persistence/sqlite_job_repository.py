@@ -1,23 +1,134 @@
-from typing import List, Optional, Dict
+import json
+import threading
+from datetime import datetime
+from typing import List, Optional
 from ...application.ports import JobRepositoryPort
-from ...domain.entities import Job
+from ...domain.entities import Job, JobStatus
+from .sqlite_database import connect
 
 
 class SQLiteJobRepository(JobRepositoryPort):
-    """In-memory repository for MVP"""
+    """SQLite-backed job repository, shared by the API and queue workers"""
 
-    def __init__(self):
-        self._jobs: Dict[str, Job] = {}
+    _COLUMNS = (
+        "job_id, business_type, file_name, file_hash, status, created_at, "
+        "updated_at, total_rows, avg_confidence, risk_percent, error_message, metadata, "
+        "summary, model_version, scoring_version"
+    )
+
+    def __init__(self, db_path: str = "storage/aurora.db"):
+        self.db_path = db_path
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " job_id TEXT PRIMARY KEY,"
+                " business_type TEXT NOT NULL,"
+                " file_name TEXT NOT NULL,"
+                " file_hash TEXT NOT NULL,"
+                " status TEXT NOT NULL,"
+                " created_at TEXT NOT NULL,"
+                " updated_at TEXT NOT NULL,"
+                " total_rows INTEGER NOT NULL DEFAULT 0,"
+                " avg_confidence REAL NOT NULL DEFAULT 0,"
+                " risk_percent REAL NOT NULL DEFAULT 0,"
+                " error_message TEXT,"
+                " metadata TEXT NOT NULL DEFAULT '{}',"
+                " summary TEXT NOT NULL DEFAULT '{}',"
+                " model_version TEXT,"
+                " scoring_version TEXT)"
+            )
+            # Databases created before job summaries / result versions were stored
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "summary" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN summary TEXT NOT NULL DEFAULT '{}'")
+            for column in ("model_version", "scoring_version"):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs (created_at)")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_fingerprint "
+                "ON jobs (file_hash, model_version, scoring_version, status)"
+            )
+
+    def _conn(self):
+        # One connection per thread; sqlite3 connections are not thread-safe
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.db_path)
+        return conn
 
     def save(self, job: Job) -> None:
-        self._jobs[job.job_id] = job
+        self._write("INSERT OR REPLACE", job)
+
+    def create(self, job: Job) -> None:
+        # Plain INSERT: an existing job_id raises sqlite3.IntegrityError
+        # instead of silently replacing another upload's job
+        self._write("INSERT", job)
+
+    def _write(self, verb: str, job: Job) -> None:
+        with self._conn() as conn:
+            conn.execute(
+                f"{verb} INTO jobs ({self._COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.job_id, job.business_type, job.file_name, job.file_hash,
+                    job.status.value, job.created_at.isoformat(), job.updated_at.isoformat(),
+                    job.total_rows, job.avg_confidence, job.risk_percent,
+                    job.error_message, json.dumps(job.metadata), json.dumps(job.summary),
+                    job.model_version, job.scoring_version,
+                )
+            )
 
     def find_by_id(self, job_id: str) -> Optional[Job]:
-        return self._jobs.get(job_id)
+        row = self._conn().execute(
+            f"SELECT {self._COLUMNS} FROM jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        return self._to_entity(row) if row else None
 
     def find_all(self, limit: int = 100, offset: int = 0) -> List[Job]:
-        all_jobs = list(self._jobs.values())
-        return all_jobs[offset:offset + limit]
+        rows = self._conn().execute(
+            f"SELECT {self._COLUMNS} FROM jobs ORDER BY created_at LIMIT ? OFFSET ?",
+            (limit, offset)
+        ).fetchall()
+        return [self._to_entity(row) for row in rows]
+
+    def find_completed_by_fingerprint(
+        self, file_hash: str, model_version: str, scoring_version: str
+    ) -> Optional[Job]:
+        row = self._conn().execute(
+            f"SELECT {self._COLUMNS} FROM jobs "
+            "WHERE file_hash = ? AND model_version = ? AND scoring_version = ? AND status = ? "
+            "ORDER BY updated_at DESC LIMIT 1",
+            (file_hash, model_version, scoring_version, JobStatus.COMPLETED.value)
+        ).fetchone()
+        return self._to_entity(row) if row else None
 
     def exists(self, job_id: str) -> bool:
-        return job_id in self._jobs
+        row = self._conn().execute(
+            "SELECT 1 FROM jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        return row is not None
+
+    @staticmethod
+    def _to_entity(row: tuple) -> Job:
+        (job_id, business_type, file_name, file_hash, status, created_at, updated_at,
+         total_rows, avg_confidence, risk_percent, error_message, metadata, summary,
+         model_version, scoring_version) = row
+        return Job(
+            job_id=job_id,
+            business_type=business_type,
+            file_name=file_name,
+            file_hash=file_hash,
+            status=JobStatus(status),
+            created_at=datetime.fromisoformat(created_at),
+            updated_at=datetime.fromisoformat(updated_at),
+            total_rows=total_rows,
+            avg_confidence=avg_confidence,
+            risk_percent=risk_percent,
+            error_message=error_message,
+            metadata=json.loads(metadata),
+            summary=json.loads(summary),
+            model_version=model_version,
+            scoring_version=scoring_version,
+        )
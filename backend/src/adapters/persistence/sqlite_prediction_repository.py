@@ -1,29 +1,279 @@
-from typing import List, Optional, Dict
+import json
+import sys
+import threading
+from typing import List, Optional, Dict, Any, Callable, Iterator
+import numpy as np
 from ...application.ports import PredictionRepositoryPort
-from ...domain.entities import PredictionRow
+from ...domain.entities import PredictionRow, PredictionBatch
+from ...domain.value_objects import TaxObjectLabel
+from .sqlite_database import connect
+
+# Separator for string lists (signals, top terms); never occurs in tokens
+_LIST_SEP = "\x1f"
 
 
 class SQLitePredictionRepository(PredictionRepositoryPort):
-    """In-memory repository for MVP"""
+    """
+    SQLite-backed prediction repository.
+
+    Rows are bulk-inserted with executemany, one transaction per batch,
+    and read back with keyset pagination on (job_id, row_index). Row counts
+    come from a per-job counter maintained in the same transactions; a row
+    is written once (inserting an existing (job_id, row_index) raises
+    sqlite3.IntegrityError and rolls the batch back), so the counter always
+    matches the table.
+
+    A job's row indices are assumed dense, 0..n-1, as ProcessJobUseCase
+    writes them and copy_job preserves them. find_by_job relies on this to
+    turn an offset into a keyset position.
+    Probability distributions are stored as float32 blobs in
+    TaxObjectLabel.all_labels() order.
+
+    Rows are written from and read into PredictionBatch columns; values
+    shared by many rows (explanations, signals, terms, examples) are
+    encoded and decoded once per batch.
+    """
 
-    def __init__(self):
-        self._predictions: Dict[str, List[PredictionRow]] = {}
+    # Everything but the row's identity (job_id, row_index, row_id)
+    _VALUE_COLUMNS = (
+        "account_name, account_code, amount, date, "
+        "debit_credit, counterparty, predicted_label, confidence, explanation, "
+        "signals, probabilities, top_terms, nearest_examples"
+    )
+    _COLUMNS = "job_id, row_index, row_id, " + _VALUE_COLUMNS
+
+    def __init__(self, db_path: str = "storage/aurora.db"):
+        self.db_path = db_path
+        self._labels = TaxObjectLabel.all_labels()
+        self._label_columns = {label: i for i, label in enumerate(self._labels)}
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS predictions ("
+                " job_id TEXT NOT NULL,"
+                " row_index INTEGER NOT NULL,"
+                " row_id TEXT NOT NULL,"
+                " account_name TEXT NOT NULL,"
+                " account_code,"  # untyped: keeps codes as uploaded (int or text)
+                " amount REAL,"
+                " date TEXT,"
+                " debit_credit TEXT,"
+                " counterparty TEXT,"
+                " predicted_label TEXT NOT NULL,"
+                " confidence REAL NOT NULL,"
+                " explanation TEXT NOT NULL,"
+                " signals TEXT NOT NULL,"
+                " probabilities BLOB,"
+                " top_terms TEXT NOT NULL,"
+                " nearest_examples TEXT)"
+            )
+            conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_predictions_job_row "
+                "ON predictions (job_id, row_index)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS prediction_counts ("
+                " job_id TEXT PRIMARY KEY,"
+                " n_rows INTEGER NOT NULL)"
+            )
+
+    def _conn(self):
+        # One connection per thread; sqlite3 connections are not thread-safe
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.db_path)
+        return conn
 
     def save_batch(self, rows: List[PredictionRow]) -> None:
-        if not rows:
+        by_job: Dict[str, List[PredictionRow]] = {}
+        for row in rows:
+            by_job.setdefault(row.job_id, []).append(row)
+        for job_id, job_rows in by_job.items():
+            self.save_prediction_batch(PredictionBatch.from_rows(job_id, job_rows, self._labels))
+
+    def save_prediction_batch(self, batch: PredictionBatch) -> None:
+        if not len(batch):
             return
-        job_id = rows[0].job_id
-        self._predictions[job_id] = rows
+        with self._conn() as conn:
+            conn.executemany(
+                f"INSERT INTO predictions ({self._COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._to_records(batch)
+            )
+            conn.execute(
+                "INSERT INTO prediction_counts (job_id, n_rows) VALUES (?, ?) "
+                "ON CONFLICT(job_id) DO UPDATE SET n_rows = n_rows + excluded.n_rows",
+                (batch.job_id, len(batch))
+            )
 
     def find_by_job(
         self, job_id: str, limit: int = 100, offset: int = 0
     ) -> List[PredictionRow]:
-        rows = self._predictions.get(job_id, [])
-        return rows[offset:offset + limit]
+        return list(self.find_batch_by_job(job_id, limit, offset))
+
+    def find_batch_by_job(
+        self, job_id: str, limit: int = 100, offset: int = 0
+    ) -> PredictionBatch:
+        # Row indices are dense (0..n-1) per job, so offset N is the row
+        # with index N: seek on the index instead of scanning past skipped
+        # rows. With gaps in the indices pages would skip rows; iterate with
+        # iter_batches_by_job, which keys on the last row seen, instead.
+        return self._find_after(job_id, offset - 1, limit)
+
+    def iter_by_job(self, job_id: str, page_size: int = 1000) -> Iterator[List[PredictionRow]]:
+        for batch in self.iter_batches_by_job(job_id, page_size):
+            yield list(batch)
+
+    def iter_batches_by_job(
+        self, job_id: str, page_size: int = 1000
+    ) -> Iterator[PredictionBatch]:
+        last_index = -1
+        while True:
+            batch = self._find_after(job_id, last_index, page_size)
+            if not len(batch):
+                return
+            yield batch
+            if len(batch) < page_size:
+                return
+            last_index = int(batch.row_index[-1])
+
+    def copy_job(self, source_job_id: str, target_job_id: str) -> int:
+        # One INSERT ... SELECT inside SQLite; rows never pass through Python
+        columns = self._VALUE_COLUMNS
+        with self._conn() as conn:
+            conn.execute("DELETE FROM predictions WHERE job_id = ?", (target_job_id,))
+            copied = conn.execute(
+                f"INSERT INTO predictions (job_id, row_index, row_id, {columns}) "
+                f"SELECT ?, row_index, ? || '_row_' || row_index, {columns} "
+                "FROM predictions WHERE job_id = ?",
+                (target_job_id, target_job_id, source_job_id)
+            ).rowcount
+            conn.execute(
+                "INSERT OR REPLACE INTO prediction_counts (job_id, n_rows) VALUES (?, ?)",
+                (target_job_id, copied)
+            )
+        return copied
 
     def count_by_job(self, job_id: str) -> int:
-        return len(self._predictions.get(job_id, []))
+        row = self._conn().execute(
+            "SELECT n_rows FROM prediction_counts WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        return row[0] if row else 0
 
     def delete_by_job(self, job_id: str) -> None:
-        if job_id in self._predictions:
-            del self._predictions[job_id]
+        with self._conn() as conn:
+            conn.execute("DELETE FROM predictions WHERE job_id = ?", (job_id,))
+            conn.execute("DELETE FROM prediction_counts WHERE job_id = ?", (job_id,))
+
+    def _find_after(self, job_id: str, last_index: int, limit: int) -> PredictionBatch:
+        records = self._conn().execute(
+            f"SELECT row_index, {self._VALUE_COLUMNS} FROM predictions "
+            "WHERE job_id = ? AND row_index > ? ORDER BY row_index LIMIT ?",
+            (job_id, last_index, limit)
+        ).fetchall()
+        return self._to_batch(job_id, records)
+
+    def _to_records(self, batch: PredictionBatch) -> Iterator[tuple]:
+        """Table rows for a batch, one tuple per prediction"""
+        n_rows = len(batch)
+        job_id = batch.job_id
+
+        # Probability blobs are slices of one buffer in all_labels() order
+        probabilities = [None] * n_rows
+        if batch.probabilities is not None:
+            matrix = batch.probabilities
+            if list(batch.labels) != self._labels:
+                columns = {label: i for i, label in enumerate(batch.labels)}
+                matrix = np.column_stack([
+                    matrix[:, columns[label]] if label in columns
+                    else np.zeros(n_rows, dtype=np.float32)
+                    for label in self._labels
+                ]).astype(np.float32)
+            buffer = np.ascontiguousarray(matrix, dtype=np.float32).tobytes()
+            width = len(self._labels) * 4
+            present = ~np.isnan(batch.probabilities[:, 0])
+            probabilities = [
+                buffer[i * width:(i + 1) * width] if has_row else None
+                for i, has_row in enumerate(present.tolist())
+            ]
+
+        join = _encode_once(_LIST_SEP.join)
+        dump = _encode_once(lambda examples: json.dumps(list(examples)) if examples else None)
+        account_codes = [
+            code if code is None or isinstance(code, (str, int, float)) else str(code)
+            for code in batch.account_code
+        ]
+        return zip(
+            [job_id] * n_rows, batch.row_index.tolist(), batch.row_ids(),
+            batch.account_name, account_codes, batch.amounts(), batch.date,
+            batch.debit_credit, batch.counterparty, batch.predicted_labels(),
+            batch.confidence.tolist(), batch.explanation,
+            map(join, batch.signals), probabilities,
+            map(join, batch.top_terms), map(dump, batch.nearest_examples),
+        )
+
+    def _to_batch(self, job_id: str, records: List[tuple]) -> PredictionBatch:
+        """Columns of a page of table rows"""
+        if not records:
+            return PredictionBatch(job_id, self._labels, [], [], [], [], [], [])
+        (row_index, account_name, account_code, amount, date, debit_credit,
+         counterparty, predicted_label, confidence, explanation, signals,
+         probabilities, top_terms, nearest_examples) = zip(*records)
+
+        probability_matrix = None
+        if any(blob is not None for blob in probabilities):
+            missing = bytes(len(self._labels) * 4)
+            probability_matrix = np.frombuffer(
+                b"".join(missing if blob is None else blob for blob in probabilities),
+                dtype=np.float32,
+            ).reshape(len(records), len(self._labels))
+            if None in probabilities:
+                probability_matrix = probability_matrix.copy()
+                probability_matrix[[blob is None for blob in probabilities]] = np.nan
+
+        split = _decode_once(lambda value: tuple(value.split(_LIST_SEP)) if value else ())
+        load = _decode_once(lambda value: tuple(json.loads(value)) if value else ())
+        return PredictionBatch(
+            job_id=job_id,
+            labels=self._labels,
+            row_index=row_index,
+            account_name=account_name,
+            label_index=[self._label_columns[label] for label in predicted_label],
+            confidence=confidence,
+            explanation=list(map(sys.intern, explanation)),
+            signals=list(map(split, signals)),
+            account_code=account_code,
+            amount=np.array(amount, dtype=np.float64),
+            date=date,
+            debit_credit=debit_credit,
+            counterparty=counterparty,
+            probabilities=probability_matrix,
+            top_terms=list(map(split, top_terms)),
+            nearest_examples=list(map(load, nearest_examples)),
+        )
+
+
+def _encode_once(encode: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """
+    Memoize encode on object identity: batch rows share one object per
+    repeated value, and the batch keeps those objects alive while encoding.
+    """
+    cache: Dict[int, Any] = {}
+
+    def encoded(value: Any) -> Any:
+        key = id(value)
+        if key not in cache:
+            cache[key] = encode(value)
+        return cache[key]
+    return encoded
+
+
+def _decode_once(decode: Callable[[str], Any]) -> Callable[[Optional[str]], Any]:
+    """Memoize decode on the stored value, so equal rows share one object"""
+    cache: Dict[Optional[str], Any] = {}
+
+    def decoded(value: Optional[str]) -> Any:
+        if value not in cache:
+            cache[value] = decode(value)
+        return cache[value]
+    return decoded
@@ -0,0 +1,164 @@
+"""
+SQLite-backed durable job queue with leases and retries
+"""
+
+import threading
+import time
+from typing import List, Optional
+from ...application.ports import JobQueuePort, QueuedJob
+from ..persistence.sqlite_database import connect
+
+
+class SQLiteJobQueue(JobQueuePort):
+    """
+    Durable queue of pending job IDs in a local SQLite file.
+
+    Workers claim jobs under a time-limited lease and keep it alive with
+    heartbeats. A job whose lease expires (worker crashed) becomes
+    claimable again; failed attempts are retried with exponential backoff
+    until max_attempts is reached, after which the job is marked dead.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "storage/aurora.db",
+        max_attempts: int = 3,
+        retry_backoff_seconds: float = 10.0,
+    ):
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_queue ("
+                " job_id TEXT PRIMARY KEY,"
+                " status TEXT NOT NULL,"  # pending | leased | done | dead
+                " attempts INTEGER NOT NULL DEFAULT 0,"
+                " available_at REAL NOT NULL,"
+                " enqueued_at REAL NOT NULL,"
+                " lease_owner TEXT,"
+                " lease_expires_at REAL,"
+                " last_error TEXT)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_job_queue_status "
+                "ON job_queue (status, available_at)"
+            )
+
+    def _conn(self):
+        # One connection per thread; heartbeats run on their own thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.db_path)
+            conn.isolation_level = None  # explicit BEGIN IMMEDIATE for claims
+        return conn
+
+    def enqueue(self, job_id: str) -> None:
+        now = time.time()
+        self._conn().execute(
+            "INSERT OR REPLACE INTO job_queue "
+            "(job_id, status, attempts, available_at, enqueued_at) "
+            "VALUES (?, 'pending', 0, ?, ?)",
+            (job_id, now, now)
+        )
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[QueuedJob]:
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT job_id, attempts FROM job_queue "
+                "WHERE attempts < ? AND ("
+                "  (status = 'pending' AND available_at <= ?)"
+                "  OR (status = 'leased' AND lease_expires_at < ?)) "
+                "ORDER BY available_at, enqueued_at LIMIT 1",
+                (self.max_attempts, now, now)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            job_id, attempts = row
+            conn.execute(
+                "UPDATE job_queue SET status = 'leased', attempts = attempts + 1, "
+                "lease_owner = ?, lease_expires_at = ? WHERE job_id = ?",
+                (worker_id, now + lease_seconds, job_id)
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return QueuedJob(job_id=job_id, attempts=attempts + 1, worker_id=worker_id)
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        cur = self._conn().execute(
+            "UPDATE job_queue SET lease_expires_at = ? "
+            "WHERE job_id = ? AND status = 'leased' AND lease_owner = ?",
+            (time.time() + lease_seconds, job_id, worker_id)
+        )
+        return cur.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str) -> bool:
+        cur = self._conn().execute(
+            "UPDATE job_queue SET status = 'done', lease_owner = NULL, lease_expires_at = NULL "
+            "WHERE job_id = ? AND status = 'leased' AND lease_owner = ?",
+            (job_id, worker_id)
+        )
+        return cur.rowcount == 1
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT attempts FROM job_queue WHERE job_id = ? AND lease_owner = ?",
+                (job_id, worker_id)
+            ).fetchone()
+            if row is None:
+                # Lease already lost to another worker
+                conn.execute("COMMIT")
+                return False
+            attempts = row[0]
+            retry = attempts < self.max_attempts
+            if retry:
+                delay = self.retry_backoff_seconds * (2 ** (attempts - 1))
+                conn.execute(
+                    "UPDATE job_queue SET status = 'pending', available_at = ?, "
+                    "lease_owner = NULL, lease_expires_at = NULL, last_error = ? "
+                    "WHERE job_id = ?",
+                    (time.time() + delay, error, job_id)
+                )
+            else:
+                conn.execute(
+                    "UPDATE job_queue SET status = 'dead', lease_owner = NULL, "
+                    "lease_expires_at = NULL, last_error = ? WHERE job_id = ?",
+                    (error, job_id)
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return retry
+
+    def reap_expired(self) -> List[str]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            job_ids = [
+                row[0] for row in conn.execute(
+                    "SELECT job_id FROM job_queue "
+                    "WHERE status = 'leased' AND lease_expires_at < ? AND attempts >= ?",
+                    (time.time(), self.max_attempts)
+                )
+            ]
+            conn.executemany(
+                "UPDATE job_queue SET status = 'dead', lease_owner = NULL, "
+                "lease_expires_at = NULL, last_error = 'lease expired' WHERE job_id = ?",
+                [(job_id,) for job_id in job_ids]
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return job_ids
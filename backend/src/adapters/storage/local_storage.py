@@ -0,0 +1,40 @@
+"""
+Local filesystem storage adapter
+"""
+
+import shutil
+from pathlib import Path
+from typing import BinaryIO
+from ...application.ports import StoragePort
+
+
+class LocalStorage(StoragePort):
+    """Local file storage"""
+
+    # Uploads are copied in fixed-size chunks, never read whole
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, base_path: str = "./storage"):
+        self.base_path = Path(base_path)
+        self.base_path.mkdir(exist_ok=True, parents=True)
+
+    def save_file(self, file: BinaryIO, job_id: str, filename: str) -> str:
+        job_dir = self.base_path / job_id
+        job_dir.mkdir(exist_ok=True)
+
+        file_path = job_dir / filename
+        try:
+            with open(file_path, 'wb') as f:
+                shutil.copyfileobj(file, f, self.CHUNK_SIZE)
+        except BaseException:
+            # Never leave a partial upload behind
+            file_path.unlink(missing_ok=True)
+            raise
+
+        return str(file_path)
+
+    def get_file_path(self, job_id: str, filename: str) -> str:
+        return str(self.base_path / job_id / filename)
+
+    def delete_file(self, file_path: str) -> None:
+        Path(file_path).unlink(missing_ok=True)
@@ -17,6 +17,10 @@ class JobSummary(BaseModel):
     total_rows: int
     avg_confidence: float
     risk_percent: float
+    total_amount: Optional[float] = None
+    label_counts: Optional[Dict[str, int]] = None
+    label_amounts: Optional[Dict[str, float]] = None
+    confidence_histogram: Optional[Dict[str, int]] = None
 
 
 class JobResponse(BaseModel):
@@ -3,6 +3,7 @@ from .classifier_port import ClassifierPort
 from .storage_port import StoragePort
 from .config_port import ConfigPort
 from .explainability_port import ExplainabilityPort
+from .job_queue_port import JobQueuePort, QueuedJob
 
 __all__ = [
     "JobRepositoryPort",
@@ -11,4 +12,6 @@ __all__ = [
     "StoragePort",
     "ConfigPort",
     "ExplainabilityPort",
+    "JobQueuePort",
+    "QueuedJob",
 ]
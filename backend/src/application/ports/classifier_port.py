@@ -3,7 +3,9 @@ Classifier Port interface.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import List, Dict, Tuple
+import numpy as np
+from ...domain.value_objects import TaxObjectLabel
 
 
 class ClassifierPort(ABC):
@@ -22,6 +24,41 @@ class ClassifierPort(ABC):
         """
         pass
 
+    def predict_matrix(self, texts: List[str]) -> Tuple[np.ndarray, List[str]]:
+        """
+        Predict probability distributions as a label-indexed matrix.
+
+        Adapters should override this natively; the default builds the
+        matrix from predict_proba for classifiers that only speak dicts.
+
+        Args:
+            texts: List of account names
+
+        Returns:
+            Tuple of (float32 array of shape (len(texts), len(labels)), labels)
+        """
+        labels = TaxObjectLabel.all_labels()
+        predictions = self.predict_proba(texts)
+        matrix = np.array(
+            [[prob_dist.get(label, 0.0) for label in labels] for prob_dist in predictions],
+            dtype=np.float32,
+        ).reshape(len(predictions), len(labels))
+        return matrix, labels
+
+    @staticmethod
+    def matrix_to_dicts(matrix: np.ndarray, labels: List[str]) -> List[Dict[str, float]]:
+        """Convert a predict_matrix result to the legacy {label: probability} form"""
+        return [dict(zip(labels, row)) for row in matrix.tolist()]
+
+    def normalize(self, text: str) -> str:
+        """
+        Normalize text the way the model sees it.
+
+        Texts with equal normalized forms get identical predictions, which
+        lets callers dedupe and cache on this key.
+        """
+        return text
+
     @abstractmethod
     def get_version(self) -> str:
         """Get model version"""
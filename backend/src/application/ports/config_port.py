@@ -3,20 +3,20 @@ Config Port interface.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Any, Mapping
 
 
 class ConfigPort(ABC):
     """Port for configuration loading"""
 
     @abstractmethod
-    def get_scoring_config(self) -> Dict[str, Any]:
-        """Get scoring configuration"""
+    def get_scoring_config(self) -> Mapping[str, Any]:
+        """Get scoring configuration (read-only; may be shared between callers)"""
         pass
 
     @abstractmethod
-    def get_priors(self) -> Dict[str, Dict[str, float]]:
-        """Get business type priors"""
+    def get_priors(self) -> Mapping[str, Mapping[str, float]]:
+        """Get business type priors (read-only; may be shared between callers)"""
         pass
 
     @abstractmethod
@@ -14,9 +14,21 @@ class ExplainabilityPort(ABC):
         """Get top contributing terms for prediction"""
         pass
 
+    def get_top_terms_batch(
+        self, texts: List[str], labels: List[str], limit: int = 5
+    ) -> List[List[str]]:
+        """Get top contributing terms for many predictions (texts[i] predicted as labels[i])"""
+        return [self.get_top_terms(text, label, limit) for text, label in zip(texts, labels)]
+
     @abstractmethod
     def get_nearest_examples(
         self, text: str, limit: int = 3
     ) -> List[Dict[str, Any]]:
         """Get nearest training examples"""
         pass
+
+    def get_nearest_examples_batch(
+        self, texts: List[str], limit: int = 3
+    ) -> List[List[Dict[str, Any]]]:
+        """Get nearest training examples for many texts"""
+        return [self.get_nearest_examples(text, limit) for text in texts]
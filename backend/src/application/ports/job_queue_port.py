@@ -0,0 +1,54 @@
+"""
+Job Queue Port interface.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass(frozen=True)
+class QueuedJob:
+    """A job claimed from the queue under a lease"""
+    job_id: str
+    attempts: int
+    worker_id: str
+
+
+class JobQueuePort(ABC):
+    """Port for the durable queue of jobs waiting to be processed"""
+
+    @abstractmethod
+    def enqueue(self, job_id: str) -> None:
+        """Add a job to the queue"""
+        pass
+
+    @abstractmethod
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[QueuedJob]:
+        """Lease the next available job, or return None if there is none"""
+        pass
+
+    @abstractmethod
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        """Extend a held lease; returns False if the lease was lost"""
+        pass
+
+    @abstractmethod
+    def complete(self, job_id: str, worker_id: str) -> bool:
+        """Mark a leased job as done; returns False if the lease was lost"""
+        pass
+
+    @abstractmethod
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        """
+        Record a failed attempt.
+
+        Returns:
+            True if the job will be retried, False if attempts are exhausted
+        """
+        pass
+
+    @abstractmethod
+    def reap_expired(self) -> List[str]:
+        """Bury jobs whose lease expired after their last allowed attempt"""
+        pass
@@ -4,8 +4,8 @@ Define contracts for persistence adapters.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from ...domain.entities import Job, PredictionRow
+from typing import List, Optional, Iterator
+from ...domain.entities import Job, PredictionRow, PredictionBatch
 
 
 class JobRepositoryPort(ABC):
@@ -16,6 +16,12 @@ class JobRepositoryPort(ABC):
         """Save or update a job"""
         pass
 
+    def create(self, job: Job) -> None:
+        """Insert a new job; raises if a job with the same ID already exists"""
+        if self.exists(job.job_id):
+            raise ValueError(f"Job {job.job_id} already exists")
+        self.save(job)
+
     @abstractmethod
     def find_by_id(self, job_id: str) -> Optional[Job]:
         """Find job by ID"""
@@ -31,6 +37,19 @@ class JobRepositoryPort(ABC):
         """Check if job exists"""
         pass
 
+    def find_completed_by_fingerprint(
+        self,
+        file_hash: str,
+        model_version: str,
+        scoring_version: str
+    ) -> Optional[Job]:
+        """
+        Find the latest completed job whose results came from the same file,
+        model version and scoring version. Returns None (no reuse) unless
+        the adapter supports the lookup.
+        """
+        return None
+
 
 class PredictionRepositoryPort(ABC):
     """Port for prediction row persistence"""
@@ -50,6 +69,54 @@ class PredictionRepositoryPort(ABC):
         """Find prediction rows by job ID with pagination"""
         pass
 
+    def iter_by_job(
+        self,
+        job_id: str,
+        page_size: int = 1000
+    ) -> Iterator[List[PredictionRow]]:
+        """Iterate over all prediction rows of a job, one page at a time"""
+        offset = 0
+        while True:
+            page = self.find_by_job(job_id, page_size, offset)
+            if not page:
+                return
+            yield page
+            offset += len(page)
+
+    def save_prediction_batch(self, batch: PredictionBatch) -> None:
+        """Save a columnar batch of prediction rows"""
+        self.save_batch(list(batch))
+
+    def find_batch_by_job(
+        self,
+        job_id: str,
+        limit: int = 100,
+        offset: int = 0
+    ) -> PredictionBatch:
+        """Find prediction rows by job ID with pagination, as one batch"""
+        return PredictionBatch.from_rows(job_id, self.find_by_job(job_id, limit, offset))
+
+    def iter_batches_by_job(
+        self,
+        job_id: str,
+        page_size: int = 1000
+    ) -> Iterator[PredictionBatch]:
+        """Iterate over all prediction rows of a job, one batch per page"""
+        for page in self.iter_by_job(job_id, page_size):
+            yield PredictionBatch.from_rows(job_id, page)
+
+    def copy_job(self, source_job_id: str, target_job_id: str) -> int:
+        """
+        Replace the target job's predictions with a copy of the source job's
+        rows, re-keyed to the target job. Returns the number of rows copied.
+        """
+        self.delete_by_job(target_job_id)
+        copied = 0
+        for batch in self.iter_batches_by_job(source_job_id):
+            self.save_prediction_batch(batch.for_job(target_job_id))
+            copied += len(batch)
+        return copied
+
     @abstractmethod
     def count_by_job(self, job_id: str) -> int:
         """Count prediction rows for a job"""
@@ -4,6 +4,7 @@ from .get_job_status_use_case import GetJobStatusUseCase
 from .get_job_rows_use_case import GetJobRowsUseCase
 from .download_results_use_case import DownloadResultsUseCase
 from .get_config_use_case import GetConfigUseCase
+from .predict_direct_use_case import PredictDirectUseCase
 
 __all__ = [
     "CreateJobUseCase",
@@ -12,4 +13,5 @@ __all__ = [
     "GetJobRowsUseCase",
     "DownloadResultsUseCase",
     "GetConfigUseCase",
+    "PredictDirectUseCase",
 ]
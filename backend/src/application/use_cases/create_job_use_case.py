@@ -3,12 +3,37 @@ Create Job Use Case
 """
 
 import hashlib
+import uuid
 from datetime import datetime
-from typing import BinaryIO
+from typing import BinaryIO, Optional
 from ...domain.entities import Job, JobStatus
+from ...domain.errors import FileTooLargeError
 from ..ports import JobRepositoryPort, StoragePort
 
 
+class _HashingReader:
+    """
+    Read-through wrapper that hashes and measures an upload while storage
+    copies it, raising FileTooLargeError once max_bytes is exceeded.
+    """
+
+    def __init__(self, file: BinaryIO, max_bytes: Optional[int]):
+        self._file = file
+        self._max_bytes = max_bytes
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._file.read(size)
+        self.size += len(chunk)
+        if self._max_bytes is not None and self.size > self._max_bytes:
+            raise FileTooLargeError(
+                f"File exceeds the {self._max_bytes / (1024 * 1024):g} MB upload limit"
+            )
+        self.sha256.update(chunk)
+        return chunk
+
+
 class CreateJobUseCase:
     """Creates a new classification job"""
 
@@ -16,9 +41,11 @@ class CreateJobUseCase:
         self,
         job_repository: JobRepositoryPort,
         storage: StoragePort,
+        max_file_bytes: Optional[int] = None,
     ):
         self.job_repository = job_repository
         self.storage = storage
+        self.max_file_bytes = max_file_bytes
 
     def execute(
         self,
@@ -36,18 +63,25 @@ class CreateJobUseCase:
 
         Returns:
             Created Job entity
+
+        Raises:
+            FileTooLargeError: If the upload exceeds max_file_bytes; nothing
+                is kept in storage in that case
         """
-        # Generate job ID
+        # Generate job ID: sortable by creation time, unique per upload
+        # (uploads of the same file in the same second must not share one)
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        job_id = f"job_{timestamp}_{hash(filename) % 10000:04d}"
+        job_id = f"job_{timestamp}_{uuid.uuid4().hex[:12]}"
 
-        # Calculate file hash
-        file.seek(0)
-        file_hash = hashlib.sha256(file.read()).hexdigest()
+        # Save file, hashing it in the same pass
         file.seek(0)
-
-        # Save file
-        self.storage.save_file(file, job_id, filename)
+        reader = _HashingReader(file, self.max_file_bytes)
+        try:
+            self.storage.save_file(reader, job_id, filename)
+        except FileTooLargeError:
+            self.storage.delete_file(self.storage.get_file_path(job_id, filename))
+            raise
+        file_hash = reader.sha256.hexdigest()
 
         # Create job entity
         job = Job(
@@ -58,7 +92,7 @@ class CreateJobUseCase:
             status=JobStatus.PENDING,
         )
 
-        # Persist
-        self.job_repository.save(job)
+        # Persist; never replaces an existing job
+        self.job_repository.create(job)
 
         return job
@@ -3,7 +3,9 @@ Download Results Use Case
 """
 
 import csv
+import zlib
 from io import StringIO
+from typing import Iterator
 from ..ports import PredictionRepositoryPort, JobRepositoryPort
 
 
@@ -11,40 +13,68 @@ class DownloadResultsUseCase:
     def __init__(
         self,
         prediction_repository: PredictionRepositoryPort,
-        job_repository: JobRepositoryPort
+        job_repository: JobRepositoryPort,
+        page_size: int = 5000
     ):
         self.prediction_repository = prediction_repository
         self.job_repository = job_repository
+        self.page_size = page_size
 
-    def execute(self, job_id: str) -> str:
-        # Get all rows
-        rows = self.prediction_repository.find_by_job(job_id, limit=10000, offset=0)
+    def execute(self, job_id: str, compress: bool = False) -> Iterator[bytes]:
+        """
+        Stream all rows of a job as CSV.
 
-        # Create CSV
-        output = StringIO()
-        if not rows:
-            return ""
+        Rows are read from the repository one page at a time and encoded as
+        they go, so memory use does not grow with the size of the job.
+
+        Args:
+            job_id: Job to export
+            compress: Gzip the stream on the fly
+
+        Returns:
+            Iterator of UTF-8 (optionally gzipped) CSV chunks
+        """
+        chunks = self._iter_csv(job_id)
+        if compress:
+            return self._gzip(chunks)
+        return chunks
 
-        # Write header
+    def _iter_csv(self, job_id: str) -> Iterator[bytes]:
         fieldnames = [
             "row_index", "account_name", "account_code", "amount", "date",
             "predicted_tax_object", "confidence_percent", "explanation", "signals"
         ]
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
+        output = StringIO()
+        writer = csv.writer(output)
+
+        # Write header; sent right away so the download starts immediately
+        writer.writerow(fieldnames)
+        yield output.getvalue().encode("utf-8")
+        output.seek(0)
+        output.truncate()
 
         # Write rows
-        for row in rows:
-            writer.writerow({
-                "row_index": row.row_index,
-                "account_name": row.account_name,
-                "account_code": row.account_code or "",
-                "amount": row.amount or "",
-                "date": row.date or "",
-                "predicted_tax_object": str(row.predicted_label),
-                "confidence_percent": row.confidence.score,
-                "explanation": row.explanation,
-                "signals": "|".join(row.signals)
-            })
-
-        return output.getvalue()
+        for batch in self.prediction_repository.iter_batches_by_job(job_id, self.page_size):
+            writer.writerows(zip(
+                batch.row_index.tolist(),
+                batch.account_name,
+                [code or "" for code in batch.account_code],
+                [amount or "" for amount in batch.amounts()],
+                [date or "" for date in batch.date],
+                batch.predicted_labels(),
+                batch.confidence.tolist(),
+                batch.explanation,
+                ["|".join(signals) for signals in batch.signals],
+            ))
+            yield output.getvalue().encode("utf-8")
+            output.seek(0)
+            output.truncate()
+
+    @staticmethod
+    def _gzip(chunks: Iterator[bytes]) -> Iterator[bytes]:
+        # wbits=31 writes a gzip header and trailer around the deflate stream;
+        # a sync flush per chunk lets each page reach the client as it is read
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
@@ -2,7 +2,7 @@
 Get Config Use Case
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Mapping
 from ..ports import ConfigPort
 
 
@@ -11,8 +11,18 @@ class GetConfigUseCase:
         self.config = config
 
     def execute(self) -> Dict[str, Any]:
+        # Config getters return read-only snapshots; hand out plain copies
         return {
             "labels": self.config.get_labels(),
-            "scoring_config": self.config.get_scoring_config(),
-            "priors": self.config.get_priors()
+            "scoring_config": self._plain(self.config.get_scoring_config()),
+            "priors": self._plain(self.config.get_priors())
         }
+
+    @classmethod
+    def _plain(cls, value: Any) -> Any:
+        """Read-only mappings and tuples as JSON-serializable dicts and lists"""
+        if isinstance(value, Mapping):
+            return {k: cls._plain(v) for k, v in value.items()}
+        if isinstance(value, tuple):
+            return [cls._plain(v) for v in value]
+        return value
@@ -14,11 +14,11 @@ class GetJobRowsUseCase:
         self, job_id: str, page: int = 1, page_size: int = 100
     ) -> Dict[str, Any]:
         offset = (page - 1) * page_size
-        rows = self.prediction_repository.find_by_job(job_id, page_size, offset)
+        batch = self.prediction_repository.find_batch_by_job(job_id, page_size, offset)
         total = self.prediction_repository.count_by_job(job_id)
 
         return {
-            "rows": [row.to_dict() for row in rows],
+            "rows": batch.to_dicts(),
             "pagination": {
                 "page": page,
                 "page_size": page_size,
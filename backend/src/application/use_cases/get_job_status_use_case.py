@@ -22,7 +22,8 @@ class GetJobStatusUseCase:
             summary = JobSummary(
                 total_rows=job.total_rows,
                 avg_confidence=round(job.avg_confidence, 2),
-                risk_percent=round(job.risk_percent, 2)
+                risk_percent=round(job.risk_percent, 2),
+                **job.summary
             )
 
         return JobResponse(
@@ -2,8 +2,10 @@
 Inspect File Use Case - Preview file structure without full processing
 """
 
+import csv
+import io
 import pandas as pd
-from typing import Dict, Any, List, BinaryIO
+from typing import Dict, Any, List, BinaryIO, Optional
 from pathlib import Path
 import logging
 
@@ -13,6 +15,9 @@ logger = logging.getLogger(__name__)
 class InspectFileUseCase:
     """Inspects uploaded files and returns metadata + preview"""
 
+    PREVIEW_ROWS = 5
+    SCAN_CHUNK_BYTES = 1 << 20
+
     def execute(self, file_stream: BinaryIO, filename: str) -> Dict[str, Any]:
         """
         Inspect file and return structure metadata + preview
@@ -36,13 +41,10 @@ class InspectFileUseCase:
     def _inspect_csv(self, file_stream: BinaryIO, filename: str) -> Dict[str, Any]:
         """Inspect CSV file"""
         try:
-            # Read first 20 rows for preview
+            # Only the preview rows are parsed; the rest is just counted
             df_preview = pd.read_csv(file_stream, nrows=20, encoding='utf-8')
             file_stream.seek(0)
-
-            # Get total row count (rough estimate)
-            df_full = pd.read_csv(file_stream, encoding='utf-8')
-            total_rows = len(df_full)
+            total_rows = self._count_csv_rows(file_stream)
 
             return {
                 "file_type": "csv",
@@ -58,7 +60,7 @@ class InspectFileUseCase:
                 "preview": {
                     "sheet_name": "Sheet1",
                     "columns": df_preview.columns.tolist(),
-                    "rows": df_preview.head(5).values.tolist(),
+                    "rows": df_preview.head(self.PREVIEW_ROWS).values.tolist(),
                     "n_rows_total": total_rows
                 },
                 "warnings": []
@@ -67,33 +69,105 @@ class InspectFileUseCase:
             logger.error(f"Error inspecting CSV: {str(e)}")
             raise ValueError(f"Failed to read CSV file: {str(e)}")
 
+    def _count_csv_rows(self, file_stream: BinaryIO) -> int:
+        """
+        Count data rows (excluding the header) the way pd.read_csv would.
+
+        Scans the raw bytes for newlines in fixed-size chunks, skipping blank
+        lines. Quoted fields may contain newlines, so as soon as a quote
+        character shows up the count restarts with a csv.reader pass.
+        """
+        lines = 0
+        tail = b""
+        while True:
+            block = file_stream.read(self.SCAN_CHUNK_BYTES)
+            if not block:
+                break
+            if b'"' in block:
+                file_stream.seek(0)
+                return self._count_csv_rows_quoted(file_stream)
+            parts = (tail + block).split(b"\n")
+            tail = parts.pop()
+            lines += sum(1 for part in parts if part.strip())
+        if tail.strip():
+            lines += 1
+        return max(lines - 1, 0)
+
+    def _count_csv_rows_quoted(self, file_stream: BinaryIO) -> int:
+        """Quote-aware row count for CSVs whose fields may span lines"""
+        text = io.TextIOWrapper(file_stream, encoding='utf-8', newline='')
+        try:
+            records = sum(
+                1 for row in csv.reader(text)
+                if row and not (len(row) == 1 and not row[0].strip())
+            )
+        finally:
+            text.detach()  # leave the caller's stream open
+        return max(records - 1, 0)
+
+    def _count_sheet_rows(self, sheet) -> int:
+        """
+        Data rows (excluding the header) of a read-only openpyxl worksheet.
+
+        Uses the sheet's dimension metadata when the writer recorded it,
+        otherwise walks the rows without converting them to a DataFrame.
+        """
+        max_row = sheet.max_row
+        if max_row is None or (max_row == 1 and sheet.max_column == 1):
+            # Missing or collapsed dimension: count up to the last non-blank row
+            max_row = 0
+            for row_number, values in enumerate(sheet.iter_rows(values_only=True), start=1):
+                if any(v is not None and v != "" for v in values):
+                    max_row = row_number
+        return max(max_row - 1, 0)
+
     def _inspect_excel(self, file_stream: BinaryIO, filename: str) -> Dict[str, Any]:
         """Inspect Excel file (handles multi-sheet)"""
         try:
             excel_file = pd.ExcelFile(file_stream, engine='openpyxl')
             sheets_info = []
             warnings = []
+            df_preview: Optional[pd.DataFrame] = None
+
+            # Counts come from the workbook itself; pandas resets a read-only
+            # sheet's dimensions when it reads it, so take them all up front
+            row_counts: Dict[str, int] = {}
+            count_errors: Dict[str, Exception] = {}
+            for sheet_name in excel_file.sheet_names:
+                try:
+                    row_counts[sheet_name] = self._count_sheet_rows(excel_file.book[sheet_name])
+                except Exception as e:
+                    count_errors[sheet_name] = e
 
             # Inspect each sheet
             for idx, sheet_name in enumerate(excel_file.sheet_names):
                 try:
-                    # Read full sheet to get row count
-                    df = pd.read_excel(excel_file, sheet_name=sheet_name)
+                    if sheet_name in count_errors:
+                        raise count_errors[sheet_name]
+                    n_rows = row_counts[sheet_name]
+
+                    # Parse only the header and the preview rows
+                    df = pd.read_excel(excel_file, sheet_name=sheet_name, nrows=self.PREVIEW_ROWS)
+                    if len(df) < self.PREVIEW_ROWS:
+                        # The whole sheet fit in the preview, so its length is exact
+                        n_rows = len(df)
 
                     # Check if sheet is empty or header-only
-                    if len(df) == 0:
+                    if n_rows == 0:
                         warnings.append(f"Sheet '{sheet_name}' is empty")
                         continue
-                    elif len(df) == 1:
+                    elif n_rows == 1:
                         warnings.append(f"Sheet '{sheet_name}' contains only header row")
 
                     sheets_info.append({
                         "name": sheet_name,
                         "index": idx,
-                        "n_rows": len(df),
+                        "n_rows": n_rows,
                         "n_cols": len(df.columns),
                         "columns": df.columns.tolist()
                     })
+                    if df_preview is None:
+                        df_preview = df
                 except Exception as e:
                     warnings.append(f"Error reading sheet '{sheet_name}': {str(e)}")
                     logger.warning(f"Sheet '{sheet_name}' failed to read: {str(e)}")
@@ -101,9 +175,8 @@ class InspectFileUseCase:
             if not sheets_info:
                 raise ValueError("No readable sheets found in Excel file")
 
-            # Get preview from first non-empty sheet
+            # Preview from first non-empty sheet
             default_sheet = sheets_info[0]["name"]
-            df_preview = pd.read_excel(excel_file, sheet_name=default_sheet, nrows=5)
 
             return {
                 "file_type": "xlsx",
@@ -0,0 +1,64 @@
+"""
+Predict Direct Use Case - Ad-hoc classification of a few account names
+"""
+
+from typing import List, Dict, Any
+from ...domain.policies import ConfidencePolicy
+from ..ports import ClassifierPort, ExplainabilityPort
+
+
+class PredictDirectUseCase:
+    """
+    Classifies a small batch of texts synchronously.
+
+    This is CPU-bound; callers on an event loop should run it in an executor.
+    """
+
+    def __init__(
+        self,
+        classifier: ClassifierPort,
+        explainer: ExplainabilityPort,
+        confidence_policy: ConfidencePolicy,
+    ):
+        self.classifier = classifier
+        self.explainer = explainer
+        self.confidence_policy = confidence_policy
+
+    def execute(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Classify texts.
+
+        Args:
+            texts: Account names
+
+        Returns:
+            One dict per text with account_name, predicted_label,
+            confidence and explanation
+        """
+        probabilities, labels = self.classifier.predict_matrix(texts)
+        label_indices = probabilities.argmax(axis=1)
+        confidences, _ = self.confidence_policy.calculate_batch(probabilities, texts)
+
+        label_strs = [labels[idx] for idx in label_indices.tolist()]
+        try:
+            all_top_terms = self.explainer.get_top_terms_batch(texts, label_strs, limit=5)
+        except Exception:
+            all_top_terms = None
+
+        results = []
+        for i, (text, predicted_label_str, confidence) in enumerate(
+            zip(texts, label_strs, confidences.tolist())
+        ):
+            if all_top_terms is None:
+                explanation = f"Classified as {predicted_label_str} based on text analysis"
+            else:
+                top_terms = all_top_terms[i]
+                explanation = f"Based on terms: {', '.join(top_terms[:3])}" if top_terms else "Classification based on text pattern"
+
+            results.append({
+                "account_name": text,
+                "predicted_label": predicted_label_str,
+                "confidence": confidence,
+                "explanation": explanation,
+            })
+        return results
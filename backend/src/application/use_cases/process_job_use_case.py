@@ -2,13 +2,17 @@
 Process Job Use Case - Core classification logic
 """
 
+import hashlib
+import json
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Iterator, Optional
 from datetime import datetime
 from ...domain.entities import (
-    Job, PredictionRow, RiskReport, AuditTrail, JobStatus
+    Job, PredictionBatch, RiskReport, AuditTrail, JobStatus
 )
-from ...domain.value_objects import TaxObjectLabel, ConfidenceScore, RiskScore
+from ...domain.errors import JobCancelledError
 from ...domain.policies import ConfidencePolicy, RiskPolicy
 from ..ports import (
     JobRepositoryPort, PredictionRepositoryPort,
@@ -19,6 +23,9 @@ from ..ports import (
 class ProcessJobUseCase:
     """Processes a classification job"""
 
+    # Equal-width buckets over 0-100% for the job's confidence histogram
+    CONFIDENCE_BUCKETS = 10
+
     def __init__(
         self,
         job_repository: JobRepositoryPort,
@@ -29,6 +36,7 @@ class ProcessJobUseCase:
         explainer: ExplainabilityPort,
         confidence_policy: ConfidencePolicy,
         risk_policy: RiskPolicy,
+        chunk_size: int = 50_000,
     ):
         self.job_repo = job_repository
         self.pred_repo = prediction_repository
@@ -38,78 +46,277 @@ class ProcessJobUseCase:
         self.explainer = explainer
         self.confidence_policy = confidence_policy
         self.risk_policy = risk_policy
-
-    def execute(self, job_id: str) -> None:
-        """Process a job"""
+        self.chunk_size = chunk_size
+
+    def execute(self, job_id: str, should_stop: Optional[Callable[[], bool]] = None) -> None:
+        """
+        Process a job.
+
+        Args:
+            job_id: Job to process
+            should_stop: Checked before every write. Once it returns True,
+                         processing stops with JobCancelledError and the
+                         job record is left alone (e.g. a queue worker
+                         lost its lease and another worker owns the job).
+        """
         # Get job
         job = self.job_repo.find_by_id(job_id)
         if not job:
             raise ValueError(f"Job {job_id} not found")
 
+        def check_stop() -> None:
+            if should_stop is not None and should_stop():
+                raise JobCancelledError(f"Processing of job {job_id} was cancelled")
+
         try:
             # Start processing
+            check_stop()
             job.start_processing()
             self.job_repo.save(job)
 
-            # Load data
-            file_path = self.storage.get_file_path(job_id, job.file_name)
-            df = self._load_data(file_path)
-
-            # Validate required columns
-            if 'account_name' not in df.columns:
-                raise ValueError("Missing required column: account_name")
-
-            # Classify
-            texts = df['account_name'].fillna("").astype(str).tolist()
-            predictions = self.classifier.predict_proba(texts)
-
-            # Create prediction rows
-            rows = self._create_prediction_rows(
-                job_id, df, predictions
-            )
+            # Predictions depend only on the file, the model and the
+            # confidence scoring settings; reuse them when all three match
+            model_version = self.classifier.get_version()
+            scoring_version = self._scoring_version()
+            if self._reuse_results(job, model_version, scoring_version, check_stop):
+                return
 
-            # Save predictions
-            self.pred_repo.save_batch(rows)
+            # Stream the file: classify, score and persist one chunk at a
+            # time, keeping only running aggregates between chunks
+            file_path = self.storage.get_file_path(job_id, job.file_name)
+            label_counts: Dict[str, int] = {}
+            label_amounts: Dict[str, float] = {}
+            confidence_histogram = [0] * self.CONFIDENCE_BUCKETS
+            bucket_width = 100 / self.CONFIDENCE_BUCKETS
+            confidence_sum = 0.0
+            total_rows = 0
+
+            for df in self._iter_chunks(file_path):
+                # Validate required columns
+                if 'account_name' not in df.columns:
+                    raise ValueError("Missing required column: account_name")
+
+                # Classify
+                texts = df['account_name'].fillna("").astype(str).tolist()
+                probabilities, labels = self.classifier.predict_matrix(texts)
+
+                # Create prediction rows
+                batch = self._create_prediction_batch(
+                    job_id, df, probabilities, labels, start_index=total_rows
+                )
+
+                # Save predictions
+                check_stop()
+                self.pred_repo.save_prediction_batch(batch)
+
+                # Accumulate summary, per label and bucket over the columns
+                n_labels = len(batch.labels)
+                label_index = batch.label_index
+                scores = batch.confidence
+                counts = np.bincount(label_index, minlength=n_labels)
+                has_amount = ~np.isnan(batch.amount)
+                amounts = np.bincount(
+                    label_index[has_amount], weights=batch.amount[has_amount], minlength=n_labels
+                )
+                # New labels enter the summary in order of first appearance
+                for idx in self._first_seen(label_index):
+                    label = batch.labels[idx]
+                    label_counts[label] = label_counts.get(label, 0) + int(counts[idx])
+                for idx in self._first_seen(label_index[has_amount]):
+                    label = batch.labels[idx]
+                    label_amounts[label] = label_amounts.get(label, 0.0) + float(amounts[idx])
+                confidence_sum = sum(scores.tolist(), confidence_sum)
+                buckets = np.minimum(
+                    (scores // bucket_width).astype(np.intp), self.CONFIDENCE_BUCKETS - 1
+                )
+                for bucket, count in enumerate(
+                    np.bincount(buckets, minlength=self.CONFIDENCE_BUCKETS).tolist()
+                ):
+                    confidence_histogram[bucket] += count
+                total_rows += len(batch)
+
+            if total_rows == 0:
+                raise ValueError("File contains no rows to classify")
 
             # Calculate risk
-            risk_report = self._calculate_risk(job, rows, df)
+            risk_report = self._calculate_risk(job, label_counts, total_rows)
 
             # Calculate summary
-            avg_confidence = sum(r.confidence.score for r in rows) / len(rows)
+            avg_confidence = confidence_sum / total_rows
+            summary = {
+                "total_amount": sum(label_amounts.values()),
+                "label_counts": label_counts,
+                "label_amounts": label_amounts,
+                "confidence_histogram": {
+                    f"{i * bucket_width:g}-{(i + 1) * bucket_width:g}": count
+                    for i, count in enumerate(confidence_histogram)
+                },
+            }
 
             # Mark completed
+            check_stop()
             job.mark_completed(
-                total_rows=len(rows),
+                total_rows=total_rows,
                 avg_confidence=avg_confidence,
                 risk_percent=risk_report.risk_score.score,
+                summary=summary,
+                model_version=model_version,
+                scoring_version=scoring_version,
             )
             self.job_repo.save(job)
 
+        except JobCancelledError:
+            raise
         except Exception as e:
+            # A job taken over meanwhile is no longer ours to mark failed
+            check_stop()
             job.mark_failed(str(e))
             self.job_repo.save(job)
             raise
 
-    def _load_data(self, file_path: str) -> pd.DataFrame:
-        """Load CSV or Excel file"""
+    def _reuse_results(
+        self, job: Job, model_version: str, scoring_version: str,
+        check_stop: Callable[[], None],
+    ) -> bool:
+        """
+        Complete the job from an earlier job over the same file, if any.
+
+        Prediction rows are copied inside the repository; only the risk
+        report, which depends on the business type's priors, is recomputed
+        from the source job's label counts. Returns False when there is
+        nothing to reuse.
+        """
+        source = self.job_repo.find_completed_by_fingerprint(
+            job.file_hash, model_version, scoring_version
+        )
+        if source is None or source.job_id == job.job_id:
+            return False
+        summary = source.summary
+        label_counts: Optional[Dict[str, int]] = summary.get("label_counts")
+        if not label_counts or source.total_rows == 0:
+            return False
+
+        check_stop()
+        copied = self.pred_repo.copy_job(source.job_id, job.job_id)
+        if copied != source.total_rows:
+            # Source rows were (partly) deleted; classify from scratch
+            check_stop()
+            self.pred_repo.delete_by_job(job.job_id)
+            return False
+
+        risk_report = self._calculate_risk(job, label_counts, source.total_rows)
+        check_stop()
+        job.mark_completed(
+            total_rows=source.total_rows,
+            avg_confidence=source.avg_confidence,
+            risk_percent=risk_report.risk_score.score,
+            summary=summary,
+            model_version=model_version,
+            scoring_version=scoring_version,
+        )
+        self.job_repo.save(job)
+        return True
+
+    def _scoring_version(self) -> str:
+        """Fingerprint of the confidence policy and explainer rows are built with"""
+        settings = json.dumps(
+            [vars(self.confidence_policy), getattr(self.explainer, "version", None)],
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(settings.encode()).hexdigest()[:16]
+
+    def _iter_chunks(self, file_path: str) -> Iterator[pd.DataFrame]:
+        """Read a CSV or Excel file as DataFrames of at most chunk_size rows"""
         if file_path.endswith('.csv'):
-            df = pd.read_csv(file_path, encoding='utf-8')
+            chunks = pd.read_csv(file_path, encoding='utf-8', chunksize=self.chunk_size)
+        elif Path(file_path).suffix.lower() in ('.xlsx', '.xlsm'):
+            chunks = self._iter_xlsx_chunks(file_path)
         else:
-            # Read Excel file - handle multi-sheet files
-            excel_file = pd.ExcelFile(file_path)
-
-            # If multiple sheets, read all and combine
-            if len(excel_file.sheet_names) > 1:
-                dfs = []
-                for sheet_name in excel_file.sheet_names:
-                    sheet_df = pd.read_excel(excel_file, sheet_name=sheet_name)
-                    sheet_df['sheet_name'] = sheet_name  # Track source sheet
-                    dfs.append(sheet_df)
-                df = pd.concat(dfs, ignore_index=True)
+            # Legacy formats openpyxl cannot stream
+            chunks = self._iter_excel_chunks(file_path)
+
+        for df in chunks:
+            yield self._map_columns(df)
+
+    def _iter_xlsx_chunks(self, file_path: str) -> Iterator[pd.DataFrame]:
+        """Stream rows of every sheet through a read-only openpyxl workbook"""
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            multi_sheet = len(workbook.sheetnames) > 1
+            for sheet_name in workbook.sheetnames:
+                rows = workbook[sheet_name].iter_rows(values_only=True)
+                header = next(rows, None)
+                if header is None:
+                    continue
+                columns = self._header_names(header)
+
+                buffer: List[tuple] = []
+                blank_run: List[tuple] = []
+                for values in rows:
+                    if len(values) > len(columns):
+                        columns += self._header_names(
+                            (None,) * (len(values) - len(columns)), start=len(columns)
+                        )
+                    if all(v is None for v in values):
+                        # Blank rows only count if data follows them,
+                        # matching pd.read_excel's trailing-row trimming
+                        blank_run.append(values)
+                        continue
+                    buffer.extend(blank_run)
+                    blank_run = []
+                    buffer.append(values)
+                    if len(buffer) >= self.chunk_size:
+                        yield self._sheet_frame(buffer, columns, sheet_name, multi_sheet)
+                        buffer = []
+                if buffer:
+                    yield self._sheet_frame(buffer, columns, sheet_name, multi_sheet)
+        finally:
+            workbook.close()
+
+    def _iter_excel_chunks(self, file_path: str) -> Iterator[pd.DataFrame]:
+        """Read legacy Excel files sheet by sheet, sliced into chunks"""
+        excel_file = pd.ExcelFile(file_path)
+        multi_sheet = len(excel_file.sheet_names) > 1
+        for sheet_name in excel_file.sheet_names:
+            sheet_df = pd.read_excel(excel_file, sheet_name=sheet_name)
+            if multi_sheet:
+                sheet_df['sheet_name'] = sheet_name  # Track source sheet
+            for start in range(0, len(sheet_df), self.chunk_size):
+                yield sheet_df.iloc[start:start + self.chunk_size]
+
+    @staticmethod
+    def _header_names(header: tuple, start: int = 0) -> List[str]:
+        """Name header cells the way pandas does (Unnamed: i, dedup suffixes)"""
+        names: List[str] = []
+        seen: Dict[str, int] = {}
+        for i, value in enumerate(header, start=start):
+            name = f"Unnamed: {i}" if value is None else str(value)
+            if name in seen:
+                seen[name] += 1
+                name = f"{name}.{seen[name]}"
             else:
-                # Single sheet - read directly
-                df = pd.read_excel(file_path)
+                seen[name] = 0
+            names.append(name)
+        return names
+
+    @staticmethod
+    def _sheet_frame(
+        rows: List[tuple], columns: List[str], sheet_name: str, multi_sheet: bool
+    ) -> pd.DataFrame:
+        """Build a chunk DataFrame from raw sheet rows"""
+        width = len(columns)
+        df = pd.DataFrame(
+            [tuple(r) + (None,) * (width - len(r)) for r in rows], columns=columns
+        ).infer_objects()
+        if multi_sheet:
+            df['sheet_name'] = sheet_name  # Track source sheet
+        return df
 
+    @staticmethod
+    def _map_columns(df: pd.DataFrame) -> pd.DataFrame:
+        """Map common column names onto account_name, amount and date"""
         # Map common column names to account_name if missing
         if 'account_name' not in df.columns:
             for col in ['description', 'account_description', 'nama_akun', 'deskripsi']:
@@ -133,79 +340,114 @@ class ProcessJobUseCase:
 
         return df
 
-    def _create_prediction_rows(
-        self, job_id: str, df: pd.DataFrame, predictions: List[Dict[str, float]]
-    ) -> List[PredictionRow]:
-        """Create prediction row entities"""
-        rows = []
-
-        for idx, (_, row_data) in enumerate(df.iterrows()):
-            prob_dist = predictions[idx]
-            account_name = str(row_data.get('account_name', ''))
-
-            # Get predicted label
-            predicted_label_str = max(prob_dist, key=prob_dist.get)
-            predicted_label = TaxObjectLabel(predicted_label_str)
+    def _create_prediction_batch(
+        self,
+        job_id: str,
+        df: pd.DataFrame,
+        probabilities: np.ndarray,
+        labels: List[str],
+        start_index: int = 0,
+    ) -> PredictionBatch:
+        """
+        Create the chunk's prediction rows as one columnar batch.
+
+        Label, confidence and explanation depend only on the account name
+        (identical names get identical probabilities), so they are computed
+        once per unique name and fanned back out by indexing; rows of the
+        same name share one explanation, signal tuple and term tuple.
+        """
+        n_rows = len(df)
+        account_names = [str(v) for v in self._column(df, 'account_name', '')]
+        amounts = (
+            pd.to_numeric(df['amount'], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+            if 'amount' in df.columns else None
+        )
+        dates = [
+            str(v) if v is not None and pd.notna(v) else None
+            for v in self._column(df, 'date')
+        ]
+
+        # Per unique account name: label, confidence, signals, explanation
+        codes, unique_names = pd.factorize(pd.Series(account_names, dtype=object), sort=False)
+        first_rows = np.full(len(unique_names), -1, dtype=np.intp)
+        first_rows[codes[::-1]] = np.arange(n_rows - 1, -1, -1)
+        unique_names = unique_names.tolist()
+        unique_probabilities = probabilities[first_rows]
+        label_indices = unique_probabilities.argmax(axis=1)
+
+        # Calculate confidence for all unique names at once
+        confidences, signal_masks = self.confidence_policy.calculate_batch(
+            unique_probabilities, unique_names
+        )
+        decoded_signals = {
+            mask: tuple(self.confidence_policy.decode_signals(mask))
+            for mask in set(signal_masks.tolist())
+        }
 
-            # Calculate confidence
-            confidence, signals = self.confidence_policy.calculate(
-                prob_dist, account_name
-            )
+        # Explain all unique names in one vectorized pass
+        unique_label_strs = [labels[idx] for idx in label_indices.tolist()]
+        unique_top_terms = [
+            tuple(terms)
+            for terms in self.explainer.get_top_terms_batch(unique_names, unique_label_strs)
+        ]
+        unique_examples = [
+            tuple(examples)
+            for examples in self.explainer.get_nearest_examples_batch(unique_names)
+        ]
+        unique_explanations = [
+            f"Based on terms: {', '.join(top_terms[:3])}" if top_terms
+            else "Classification based on text pattern"
+            for top_terms in unique_top_terms
+        ]
+        unique_signals = [decoded_signals[mask] for mask in signal_masks.tolist()]
+
+        code_list = codes.tolist()
+        return PredictionBatch(
+            job_id=job_id,
+            labels=labels,
+            row_index=np.arange(start_index, start_index + n_rows),
+            account_name=account_names,
+            label_index=label_indices[codes],
+            confidence=np.asarray(confidences, dtype=np.float64)[codes],
+            explanation=[unique_explanations[c] for c in code_list],
+            signals=[unique_signals[c] for c in code_list],
+            account_code=self._column(df, 'account_code'),
+            amount=amounts,
+            date=dates,
+            probabilities=probabilities,
+            top_terms=[unique_top_terms[c] for c in code_list],
+            nearest_examples=[unique_examples[c] for c in code_list],
+        )
 
-            # Get explanation
-            top_terms = self.explainer.get_top_terms(
-                account_name, predicted_label_str
-            )
-            explanation = f"Based on terms: {', '.join(top_terms[:3])}"
-
-            # Create row
-            pred_row = PredictionRow(
-                row_id=f"{job_id}_row_{idx}",
-                job_id=job_id,
-                row_index=idx,
-                account_name=account_name,
-                predicted_label=predicted_label,
-                confidence=confidence,
-                explanation=explanation,
-                signals=signals,
-                account_code=row_data.get('account_code'),
-                amount=row_data.get('amount'),
-                date=str(row_data.get('date')) if pd.notna(row_data.get('date')) else None,
-                probability_distribution=prob_dist,
-                top_terms=top_terms,
-            )
-            rows.append(pred_row)
+    @staticmethod
+    def _first_seen(values: np.ndarray) -> List[int]:
+        """Distinct values in order of first occurrence"""
+        distinct, first = np.unique(values, return_index=True)
+        return distinct[np.argsort(first)].tolist()
 
-        return rows
+    @staticmethod
+    def _column(df: pd.DataFrame, name: str, default: Any = None) -> List[Any]:
+        """Get a column as a Python list, or a list of defaults if absent"""
+        if name not in df.columns:
+            return [default] * len(df)
+        return df[name].tolist()
 
     def _calculate_risk(
-        self, job: Job, rows: List[PredictionRow], df: pd.DataFrame
+        self, job: Job, label_counts: Dict[str, int], total_rows: int
     ) -> RiskReport:
-        """Calculate risk report"""
+        """Calculate risk report from accumulated label counts"""
         # Get expected priors
         priors = self.config.get_priors()
-        expected_dist = priors.get(job.business_type, priors.get("Default", {}))
-
-        # Calculate observed distribution
-        label_counts = {}
-        total_weight = 0.0
-
-        for row in rows:
-            label = str(row.predicted_label)
-            weight = abs(row.amount) if row.amount else 1.0
-            weight *= row.confidence.score / 100.0
-
-            label_counts[label] = label_counts.get(label, 0) + 1
-            total_weight += weight
+        expected_dist = dict(priors.get(job.business_type, priors.get("Default", {})))
 
         # Normalize to distribution
         observed_dist = {
-            label: (count / len(rows)) for label, count in label_counts.items()
+            label: (count / total_rows) for label, count in label_counts.items()
         }
 
         # Calculate risk
         risk_score, anomaly_components, distance, anomaly =             self.risk_policy.calculate(
-                observed_dist, expected_dist, label_counts, len(rows)
+                observed_dist, expected_dist, label_counts, total_rows
             )
 
         return RiskReport(
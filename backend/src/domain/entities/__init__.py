@@ -1,5 +1,6 @@
 from .job import Job, JobStatus
 from .prediction_row import PredictionRow
+from .prediction_batch import PredictionBatch
 from .risk_report import RiskReport
 from .audit_trail import AuditTrail
 
@@ -7,6 +8,7 @@ __all__ = [
     "Job",
     "JobStatus",
     "PredictionRow",
+    "PredictionBatch",
     "RiskReport",
     "AuditTrail",
 ]
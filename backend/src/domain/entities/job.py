@@ -37,6 +37,9 @@ class Job:
         risk_percent: float = 0.0,
         error_message: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None,
+        summary: Optional[Dict[str, Any]] = None,
+        model_version: Optional[str] = None,
+        scoring_version: Optional[str] = None,
     ):
         """
         Create a Job entity.
@@ -54,6 +57,11 @@ class Job:
             risk_percent: Dataset-level risk score
             error_message: Error message if job failed
             metadata: Additional job metadata
+            summary: Aggregates computed when the job completed
+                     (total_amount, label_counts, label_amounts,
+                     confidence_histogram)
+            model_version: Classifier version the predictions came from
+            scoring_version: Fingerprint of the confidence scoring settings
         """
         self._job_id = job_id
         self._business_type = business_type
@@ -67,6 +75,9 @@ class Job:
         self._risk_percent = risk_percent
         self._error_message = error_message
         self._metadata = metadata or {}
+        self._summary = summary or {}
+        self._model_version = model_version
+        self._scoring_version = scoring_version
 
     # Properties
     @property
@@ -117,6 +128,18 @@ class Job:
     def metadata(self) -> Dict[str, Any]:
         return self._metadata.copy()
 
+    @property
+    def summary(self) -> Dict[str, Any]:
+        return self._summary.copy()
+
+    @property
+    def model_version(self) -> Optional[str]:
+        return self._model_version
+
+    @property
+    def scoring_version(self) -> Optional[str]:
+        return self._scoring_version
+
     # Business logic
     def start_processing(self) -> None:
         """
@@ -136,7 +159,10 @@ class Job:
         self,
         total_rows: int,
         avg_confidence: float,
-        risk_percent: float
+        risk_percent: float,
+        summary: Optional[Dict[str, Any]] = None,
+        model_version: Optional[str] = None,
+        scoring_version: Optional[str] = None,
     ) -> None:
         """
         Mark job as completed with results.
@@ -145,6 +171,9 @@ class Job:
             total_rows: Total number of processed rows
             avg_confidence: Average confidence score
             risk_percent: Dataset-level risk score
+            summary: Precomputed aggregates served by status lookups
+            model_version: Classifier version the predictions came from
+            scoring_version: Fingerprint of the confidence scoring settings
 
         Raises:
             InvalidJobStatusError: If transition is invalid
@@ -157,6 +186,9 @@ class Job:
         self._total_rows = total_rows
         self._avg_confidence = avg_confidence
         self._risk_percent = risk_percent
+        self._summary = summary or {}
+        self._model_version = model_version
+        self._scoring_version = scoring_version
         self._updated_at = datetime.utcnow()
 
     def mark_failed(self, error_message: str) -> None:
@@ -177,6 +209,21 @@ class Job:
         self._error_message = error_message
         self._updated_at = datetime.utcnow()
 
+    def reset_for_retry(self) -> None:
+        """
+        Return an interrupted or failed job to pending so it can be re-run.
+
+        Raises:
+            InvalidJobStatusError: If transition is invalid
+        """
+        if self._status not in [JobStatus.PROCESSING, JobStatus.FAILED]:
+            raise InvalidJobStatusError(
+                f"Cannot retry job in status {self._status.value}"
+            )
+        self._status = JobStatus.PENDING
+        self._error_message = None
+        self._updated_at = datetime.utcnow()
+
     def is_terminal(self) -> bool:
         """Check if job is in a terminal status"""
         return self._status in [JobStatus.COMPLETED, JobStatus.FAILED]
@@ -0,0 +1,376 @@
+"""
+Prediction Batch Entity - many prediction rows of one job, stored by column.
+"""
+
+import math
+from types import MappingProxyType
+from typing import Optional, List, Dict, Any, Iterator, Mapping, Sequence, Tuple
+import numpy as np
+from .prediction_row import PredictionRow
+from ..value_objects import TaxObjectLabel, ConfidenceScore
+from ..errors import (
+    DomainValidationError, InvalidTaxObjectLabelError, InvalidConfidenceScoreError
+)
+
+
+class PredictionBatch:
+    """
+    Prediction rows of one job in columnar form.
+
+    Numeric columns are read-only NumPy arrays: row index, predicted label
+    (an index into `labels`), confidence, amount (NaN when missing) and a
+    float32 (rows x labels) probability matrix (a NaN row when a row has no
+    distribution). Text columns are lists; values repeated across rows
+    (explanations, signal and term tuples, example lists) are one shared
+    object rather than a copy per row.
+
+    Row ids are not stored: they are always "<job_id>_row_<row_index>".
+    PredictionRow objects are only built when rows are iterated.
+    """
+
+    __slots__ = (
+        "_job_id", "_labels", "_row_index", "_account_name", "_label_index",
+        "_confidence", "_explanation", "_signals", "_account_code", "_amount",
+        "_date", "_debit_credit", "_counterparty", "_probabilities",
+        "_top_terms", "_nearest_examples", "_label_objects",
+    )
+
+    def __init__(
+        self,
+        job_id: str,
+        labels: Sequence[str],
+        row_index: Sequence[int],
+        account_name: Sequence[str],
+        label_index: Sequence[int],
+        confidence: Sequence[float],
+        explanation: Sequence[str],
+        signals: Sequence[Tuple[str, ...]],
+        account_code: Optional[Sequence[Any]] = None,
+        amount: Optional[Sequence[float]] = None,
+        date: Optional[Sequence[Optional[str]]] = None,
+        debit_credit: Optional[Sequence[Optional[str]]] = None,
+        counterparty: Optional[Sequence[Optional[str]]] = None,
+        probabilities: Optional[np.ndarray] = None,
+        top_terms: Optional[Sequence[Tuple[str, ...]]] = None,
+        nearest_examples: Optional[Sequence[Tuple[Dict[str, Any], ...]]] = None,
+    ):
+        """
+        Create a PredictionBatch.
+
+        Args:
+            job_id: Parent job identifier
+            labels: Label vocabulary; label_index and probability columns
+                    refer to it
+            row_index: Index of each row in the original file
+            account_name: GL account names
+            label_index: Predicted label of each row, as an index into labels
+            confidence: Confidence scores (0-100)
+            explanation: Human-readable explanations
+            signals: Risk/quality signals per row
+            account_code: GL account codes
+            amount: Transaction amounts (NaN or None when missing)
+            date: Transaction dates
+            debit_credit: Debit or credit indicators
+            counterparty: Transaction counterparties
+            probabilities: (rows, len(labels)) probability matrix
+            top_terms: Top contributing TF-IDF terms per row
+            nearest_examples: Nearest training examples per row
+
+        Raises:
+            DomainValidationError: If columns differ in length
+            InvalidTaxObjectLabelError: If a predicted label is not valid
+            InvalidConfidenceScoreError: If a confidence is out of range
+        """
+        n_rows = len(row_index)
+        self._job_id = job_id
+        self._labels = tuple(labels)
+        self._row_index = self._frozen(row_index, np.int64)
+        self._label_index = self._frozen(label_index, np.intp)
+        self._confidence = self._frozen(confidence, np.float64)
+        self._amount = (
+            self._frozen(amount, np.float64) if amount is not None
+            else self._frozen(np.full(n_rows, np.nan), np.float64)
+        )
+        self._probabilities = (
+            self._frozen(probabilities, np.float32) if probabilities is not None else None
+        )
+        self._account_name = list(account_name)
+        self._explanation = list(explanation)
+        self._signals = list(signals)
+        self._account_code = self._optional(account_code, n_rows, None)
+        self._date = self._optional(date, n_rows, None)
+        self._debit_credit = self._optional(debit_credit, n_rows, None)
+        self._counterparty = self._optional(counterparty, n_rows, None)
+        self._top_terms = self._optional(top_terms, n_rows, ())
+        self._nearest_examples = self._optional(nearest_examples, n_rows, ())
+
+        columns = [
+            self._label_index, self._confidence, self._amount, self._account_name,
+            self._explanation, self._signals, self._account_code, self._date,
+            self._debit_credit, self._counterparty, self._top_terms, self._nearest_examples,
+        ]
+        if any(len(column) != n_rows for column in columns):
+            raise DomainValidationError("All batch columns must have one value per row")
+        if self._probabilities is not None and (
+            self._probabilities.shape != (n_rows, len(self._labels))
+        ):
+            raise DomainValidationError(
+                f"Probabilities must have shape ({n_rows}, {len(self._labels)}), "
+                f"got {self._probabilities.shape}"
+            )
+
+        # Validate each predicted label once; TaxObjectLabel objects are shared
+        self._label_objects: Dict[int, TaxObjectLabel] = {}
+        for idx in np.unique(self._label_index).tolist():
+            if not 0 <= idx < len(self._labels):
+                raise InvalidTaxObjectLabelError(f"Label index {idx} is out of range")
+            self._label_objects[idx] = TaxObjectLabel(self._labels[idx])
+
+        in_range = (
+            (self._confidence >= ConfidenceScore.MIN_SCORE)
+            & (self._confidence <= ConfidenceScore.MAX_SCORE)
+        )
+        if not in_range.all():
+            bad = self._confidence[~in_range][0]
+            raise InvalidConfidenceScoreError(
+                f"Score must be between {ConfidenceScore.MIN_SCORE} and "
+                f"{ConfidenceScore.MAX_SCORE}, got {bad}"
+            )
+
+    @staticmethod
+    def _frozen(values: Any, dtype: Any) -> np.ndarray:
+        """Read-only array view (no copy when values already have the dtype)"""
+        array = np.asarray(values, dtype=dtype).view()
+        array.flags.writeable = False
+        return array
+
+    @staticmethod
+    def _optional(values: Optional[Sequence[Any]], n_rows: int, default: Any) -> List[Any]:
+        return list(values) if values is not None else [default] * n_rows
+
+    @classmethod
+    def from_rows(
+        cls,
+        job_id: str,
+        rows: Sequence[PredictionRow],
+        labels: Optional[Sequence[str]] = None,
+    ) -> "PredictionBatch":
+        """
+        Build a batch from prediction rows of one job.
+
+        Args:
+            job_id: Job the rows belong to
+            rows: Prediction rows
+            labels: Label vocabulary (defaults to TaxObjectLabel.all_labels())
+        """
+        labels = list(labels) if labels is not None else TaxObjectLabel.all_labels()
+        column = {label: i for i, label in enumerate(labels)}
+        probabilities = None
+        if any(row.probability_distribution for row in rows):
+            probabilities = np.full((len(rows), len(labels)), np.nan, dtype=np.float32)
+            for i, row in enumerate(rows):
+                prob_dist = row.probability_distribution
+                if prob_dist:
+                    probabilities[i] = [prob_dist.get(label, 0.0) for label in labels]
+
+        return cls(
+            job_id=job_id,
+            labels=labels,
+            row_index=[row.row_index for row in rows],
+            account_name=[row.account_name for row in rows],
+            label_index=[column[str(row.predicted_label)] for row in rows],
+            confidence=[row.confidence.score for row in rows],
+            explanation=[row.explanation for row in rows],
+            signals=[row.signals for row in rows],
+            account_code=[row.account_code for row in rows],
+            amount=[np.nan if row.amount is None else row.amount for row in rows],
+            date=[row.date for row in rows],
+            debit_credit=[row.debit_credit for row in rows],
+            counterparty=[row.counterparty for row in rows],
+            probabilities=probabilities,
+            top_terms=[row.top_terms for row in rows],
+            nearest_examples=[row.nearest_examples for row in rows],
+        )
+
+    # Columns
+    @property
+    def job_id(self) -> str:
+        return self._job_id
+
+    @property
+    def labels(self) -> Tuple[str, ...]:
+        return self._labels
+
+    @property
+    def row_index(self) -> np.ndarray:
+        return self._row_index
+
+    @property
+    def account_name(self) -> List[str]:
+        return self._account_name
+
+    @property
+    def label_index(self) -> np.ndarray:
+        return self._label_index
+
+    @property
+    def confidence(self) -> np.ndarray:
+        return self._confidence
+
+    @property
+    def explanation(self) -> List[str]:
+        return self._explanation
+
+    @property
+    def signals(self) -> List[Tuple[str, ...]]:
+        return self._signals
+
+    @property
+    def account_code(self) -> List[Any]:
+        return self._account_code
+
+    @property
+    def amount(self) -> np.ndarray:
+        return self._amount
+
+    @property
+    def date(self) -> List[Optional[str]]:
+        return self._date
+
+    @property
+    def debit_credit(self) -> List[Optional[str]]:
+        return self._debit_credit
+
+    @property
+    def counterparty(self) -> List[Optional[str]]:
+        return self._counterparty
+
+    @property
+    def probabilities(self) -> Optional[np.ndarray]:
+        return self._probabilities
+
+    @property
+    def top_terms(self) -> List[Tuple[str, ...]]:
+        return self._top_terms
+
+    @property
+    def nearest_examples(self) -> List[Tuple[Dict[str, Any], ...]]:
+        return self._nearest_examples
+
+    def row_ids(self) -> List[str]:
+        """Row id of every row"""
+        prefix = f"{self._job_id}_row_"
+        return [f"{prefix}{idx}" for idx in self._row_index.tolist()]
+
+    def predicted_labels(self) -> List[str]:
+        """Predicted label string of every row"""
+        return np.asarray(self._labels, dtype=object)[self._label_index].tolist()
+
+    def amounts(self) -> List[Optional[float]]:
+        """Amounts as Python floats, None where missing"""
+        return [None if math.isnan(v) else v for v in self._amount.tolist()]
+
+    # Business logic
+    def for_job(self, job_id: str) -> "PredictionBatch":
+        """Same predictions re-keyed to another job; columns are shared"""
+        batch = object.__new__(PredictionBatch)
+        for name in self.__slots__:
+            setattr(batch, name, getattr(self, name))
+        batch._job_id = job_id
+        return batch
+
+    def row(self, i: int) -> PredictionRow:
+        """Materialize one row"""
+        return self._make_row(
+            i, int(self._row_index[i]), float(self._confidence[i]),
+            None if math.isnan(self._amount[i]) else float(self._amount[i]),
+            self._probabilities[i].tolist() if self._probabilities is not None else None,
+        )
+
+    def __len__(self) -> int:
+        return len(self._row_index)
+
+    def __iter__(self) -> Iterator[PredictionRow]:
+        probabilities = (
+            self._probabilities.tolist() if self._probabilities is not None
+            else [None] * len(self)
+        )
+        for i, (row_index, confidence, amount, prob_row) in enumerate(zip(
+            self._row_index.tolist(), self._confidence.tolist(),
+            self.amounts(), probabilities,
+        )):
+            yield self._make_row(i, row_index, confidence, amount, prob_row)
+
+    def _make_row(
+        self, i: int, row_index: int, confidence: float,
+        amount: Optional[float], prob_row: Optional[List[float]],
+    ) -> PredictionRow:
+        return PredictionRow(
+            row_id=f"{self._job_id}_row_{row_index}",
+            job_id=self._job_id,
+            row_index=row_index,
+            account_name=self._account_name[i],
+            predicted_label=self._label_objects[int(self._label_index[i])],
+            confidence=ConfidenceScore(confidence),
+            explanation=self._explanation[i],
+            signals=self._signals[i],
+            account_code=self._account_code[i],
+            amount=amount,
+            date=self._date[i],
+            debit_credit=self._debit_credit[i],
+            counterparty=self._counterparty[i],
+            probability_distribution=self._distribution(prob_row),
+            top_terms=self._top_terms[i],
+            nearest_examples=self._nearest_examples[i],
+        )
+
+    def _distribution(self, prob_row: Optional[List[float]]) -> Optional[Mapping[str, float]]:
+        if prob_row is None or math.isnan(prob_row[0]):
+            return None
+        return MappingProxyType(dict(zip(self._labels, prob_row)))
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Serialize every row, in PredictionRow.to_dict() format, straight
+        from the columns without building row entities.
+        """
+        probabilities = (
+            self._probabilities.tolist() if self._probabilities is not None
+            else [None] * len(self)
+        )
+        labels = self._labels
+        return [
+            {
+                "row_id": row_id,
+                "job_id": self._job_id,
+                "row_index": row_index,
+                "account_name": account_name,
+                "account_code": account_code,
+                "amount": amount,
+                "date": date,
+                "debit_credit": debit_credit,
+                "counterparty": counterparty,
+                "predicted_tax_object": label,
+                "confidence_percent": confidence,
+                "explanation": explanation,
+                "signals": list(signals),
+                "probability_distribution": (
+                    dict(zip(labels, prob_row))
+                    if prob_row is not None and not math.isnan(prob_row[0]) else {}
+                ),
+                "top_terms": list(top_terms),
+                "nearest_examples": list(nearest_examples),
+            }
+            for (row_id, row_index, account_name, account_code, amount, date,
+                 debit_credit, counterparty, label, confidence, explanation,
+                 signals, prob_row, top_terms, nearest_examples) in zip(
+                self.row_ids(), self._row_index.tolist(), self._account_name,
+                self._account_code, self.amounts(), self._date, self._debit_credit,
+                self._counterparty, self.predicted_labels(), self._confidence.tolist(),
+                self._explanation, self._signals, probabilities, self._top_terms,
+                self._nearest_examples,
+            )
+        ]
+
+    def __repr__(self) -> str:
+        return f"PredictionBatch(job_id='{self._job_id}', rows={len(self)})"
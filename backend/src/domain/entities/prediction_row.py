@@ -2,15 +2,26 @@
 Prediction Row Entity - represents a single GL row prediction.
 """
 
-from typing import Optional, List, Dict, Any
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Mapping, Sequence, Tuple
 from ..value_objects import TaxObjectLabel, ConfidenceScore
 
 
 class PredictionRow:
     """
     Represents a single prediction row for a GL entry.
+
+    Immutable: list and mapping fields are stored as tuples and read-only
+    mappings, so getters hand them out without copying.
     """
 
+    __slots__ = (
+        "_row_id", "_job_id", "_row_index", "_account_name", "_predicted_label",
+        "_confidence", "_explanation", "_signals", "_account_code", "_amount",
+        "_date", "_debit_credit", "_counterparty", "_probability_distribution",
+        "_top_terms", "_nearest_examples",
+    )
+
     def __init__(
         self,
         row_id: str,
@@ -20,15 +31,15 @@ class PredictionRow:
         predicted_label: TaxObjectLabel,
         confidence: ConfidenceScore,
         explanation: str,
-        signals: List[str],
+        signals: Sequence[str],
         account_code: Optional[str] = None,
         amount: Optional[float] = None,
         date: Optional[str] = None,
         debit_credit: Optional[str] = None,
         counterparty: Optional[str] = None,
-        probability_distribution: Optional[Dict[str, float]] = None,
-        top_terms: Optional[List[str]] = None,
-        nearest_examples: Optional[List[Dict[str, Any]]] = None,
+        probability_distribution: Optional[Mapping[str, float]] = None,
+        top_terms: Optional[Sequence[str]] = None,
+        nearest_examples: Optional[Sequence[Mapping[str, Any]]] = None,
     ):
         """
         Create a PredictionRow.
@@ -58,15 +69,18 @@ class PredictionRow:
         self._predicted_label = predicted_label
         self._confidence = confidence
         self._explanation = explanation
-        self._signals = signals or []
+        self._signals = tuple(signals or ())
         self._account_code = account_code
         self._amount = amount
         self._date = date
         self._debit_credit = debit_credit
         self._counterparty = counterparty
-        self._probability_distribution = probability_distribution or {}
-        self._top_terms = top_terms or []
-        self._nearest_examples = nearest_examples or []
+        self._probability_distribution = (
+            probability_distribution if isinstance(probability_distribution, MappingProxyType)
+            else MappingProxyType(dict(probability_distribution or {}))
+        )
+        self._top_terms = tuple(top_terms or ())
+        self._nearest_examples = tuple(nearest_examples or ())
 
     # Properties
     @property
@@ -98,8 +112,8 @@ class PredictionRow:
         return self._explanation
 
     @property
-    def signals(self) -> List[str]:
-        return self._signals.copy()
+    def signals(self) -> Tuple[str, ...]:
+        return self._signals
 
     @property
     def account_code(self) -> Optional[str]:
@@ -122,16 +136,16 @@ class PredictionRow:
         return self._counterparty
 
     @property
-    def probability_distribution(self) -> Dict[str, float]:
-        return self._probability_distribution.copy()
+    def probability_distribution(self) -> Mapping[str, float]:
+        return self._probability_distribution
 
     @property
-    def top_terms(self) -> List[str]:
-        return self._top_terms.copy()
+    def top_terms(self) -> Tuple[str, ...]:
+        return self._top_terms
 
     @property
-    def nearest_examples(self) -> List[Dict[str, Any]]:
-        return self._nearest_examples.copy()
+    def nearest_examples(self) -> Tuple[Mapping[str, Any], ...]:
+        return self._nearest_examples
 
     # Business logic
     def is_high_confidence(self, threshold: float = 80.0) -> bool:
@@ -167,10 +181,10 @@ class PredictionRow:
             "predicted_tax_object": str(self._predicted_label),
             "confidence_percent": self._confidence.score,
             "explanation": self._explanation,
-            "signals": self._signals,
-            "probability_distribution": self._probability_distribution,
-            "top_terms": self._top_terms,
-            "nearest_examples": self._nearest_examples,
+            "signals": list(self._signals),
+            "probability_distribution": dict(self._probability_distribution),
+            "top_terms": list(self._top_terms),
+            "nearest_examples": list(self._nearest_examples),
         }
 
     def __repr__(self) -> str:
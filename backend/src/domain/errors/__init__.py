@@ -7,6 +7,8 @@ from .domain_errors import (
     InvalidJobStatusError,
     MissingRequiredFieldError,
     InvalidBusinessTypeError,
+    FileTooLargeError,
+    JobCancelledError,
 )
 
 __all__ = [
@@ -18,4 +20,6 @@ __all__ = [
     "InvalidJobStatusError",
     "MissingRequiredFieldError",
     "InvalidBusinessTypeError",
+    "FileTooLargeError",
+    "JobCancelledError",
 ]
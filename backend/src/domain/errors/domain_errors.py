@@ -42,3 +42,13 @@ class MissingRequiredFieldError(DomainValidationError):
 class InvalidBusinessTypeError(DomainValidationError):
     """Raised when business type is not recognized"""
     pass
+
+
+class FileTooLargeError(DomainValidationError):
+    """Raised when an uploaded file exceeds the configured size limit"""
+    pass
+
+
+class JobCancelledError(DomainError):
+    """Raised when a job's processing is abandoned before it completes"""
+    pass
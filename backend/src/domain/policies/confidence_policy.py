@@ -5,9 +5,29 @@ Pure domain logic, no framework dependencies.
 
 import math
 import re
-from typing import Dict, List
+from typing import Dict, List, Sequence
+import numpy as np
 from ..value_objects import ConfidenceScore
 
+# Quality signal bits used by ConfidencePolicy.calculate_batch
+SIGNAL_SHORT_TEXT = 1
+SIGNAL_VAGUE_TEXT = 2
+SIGNAL_MOSTLY_SYMBOLS = 4
+
+SIGNAL_NAMES = (
+    (SIGNAL_SHORT_TEXT, "short_text"),
+    (SIGNAL_VAGUE_TEXT, "vague_text"),
+    (SIGNAL_MOSTLY_SYMBOLS, "mostly_symbols"),
+)
+
+VAGUE_KEYWORDS = (
+    "unknown", "misc", "miscellaneous", "other", "others",
+    "lain", "lainnya", "umum", "berbagai"
+)
+
+_VAGUE_PATTERN = re.compile("|".join(re.escape(k) for k in VAGUE_KEYWORDS))
+_NON_LETTER_PATTERN = re.compile(r'[^a-zA-Z]+')
+
 
 class ConfidencePolicy:
     """
@@ -102,26 +122,98 @@ class ConfidencePolicy:
 
         return ConfidenceScore(confidence_percent), signals
 
+    def calculate_batch(
+        self,
+        probabilities: np.ndarray,
+        account_names: Sequence[str],
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate confidence scores for a batch of predictions.
+
+        Produces the same numbers as calling calculate() row by row.
+
+        Args:
+            probabilities: (n, k) matrix of label probabilities
+            account_names: The n account name texts
+
+        Returns:
+            Tuple of (float64 confidence percentages, uint8 signal bitmasks);
+            decode a bitmask with decode_signals()
+        """
+        n_rows = len(account_names)
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+
+        # Top two probabilities per row
+        k = probabilities.shape[1] if probabilities.ndim == 2 else 0
+        if k >= 2:
+            top_two = np.partition(probabilities, k - 2, axis=1)[:, k - 2:]
+            p_max = top_two[:, 1]
+            margin = p_max - top_two[:, 0]
+        elif k == 1:
+            p_max = probabilities[:, 0]
+            margin = p_max.copy()
+        else:
+            p_max = np.zeros(n_rows)
+            margin = np.zeros(n_rows)
+
+        # Base confidence calculation
+        confidence_raw = (
+            self.p_max_weight * p_max +
+            self.margin_weight * (1.0 / (1.0 + np.exp(-10 * margin)))
+        )
+
+        # Quality signals depend only on the text: compute all three once
+        # per distinct text, then fan the bitmasks out to the rows
+        text_signals = {text: self._signal_mask(text) for text in dict.fromkeys(account_names)}
+        signals = np.fromiter(
+            (text_signals[t] for t in account_names), dtype=np.uint8, count=n_rows
+        )
+        short = (signals & SIGNAL_SHORT_TEXT).astype(bool)
+        vague = (signals & SIGNAL_VAGUE_TEXT).astype(bool)
+        symbols = (signals & SIGNAL_MOSTLY_SYMBOLS).astype(bool)
+
+        # Apply penalties in the same order as calculate()
+        confidence_raw = np.where(short, confidence_raw * self.short_text_penalty, confidence_raw)
+        confidence_raw = np.where(vague, confidence_raw * self.vague_text_penalty, confidence_raw)
+        confidence_raw = np.where(symbols, confidence_raw * self.short_text_penalty, confidence_raw)
+
+        # Clamp to [0, 1] and convert to percentage (Python round keeps
+        # results identical to the scalar path)
+        confidence_raw = np.clip(confidence_raw, 0.0, 1.0)
+        confidence_percent = np.array(
+            [round(v * 100, 1) for v in confidence_raw.tolist()], dtype=np.float64
+        )
+
+        return confidence_percent, signals
+
+    @staticmethod
+    def decode_signals(mask: int) -> List[str]:
+        """Convert a calculate_batch signal bitmask to signal names"""
+        return [name for bit, name in SIGNAL_NAMES if mask & bit]
+
+    def _signal_mask(self, text: str) -> int:
+        """Quality signal bitmask of one text"""
+        return (
+            (SIGNAL_SHORT_TEXT if self._is_short_text(text) else 0) |
+            (SIGNAL_VAGUE_TEXT if self._is_vague_text(text) else 0) |
+            (SIGNAL_MOSTLY_SYMBOLS if self._is_mostly_symbols(text) else 0)
+        )
+
     def _is_short_text(self, text: str) -> bool:
         """Check if text is too short"""
         return len(text.strip()) < self.short_text_threshold
 
     def _is_vague_text(self, text: str) -> bool:
         """Check if text contains vague keywords"""
-        vague_keywords = [
-            "unknown", "misc", "miscellaneous", "other", "others",
-            "lain", "lainnya", "umum", "berbagai"
-        ]
-        text_lower = text.lower()
-        return any(keyword in text_lower for keyword in vague_keywords)
+        return _VAGUE_PATTERN.search(text.lower()) is not None
 
     def _is_mostly_symbols(self, text: str) -> bool:
         """Check if text is mostly digits or symbols"""
         if not text:
             return False
 
-        # Count alphanumeric vs total characters
-        alphanumeric = len(re.findall(r'[a-zA-Z]', text))
+        # Count alphabetic vs total characters
+        alphanumeric = len(_NON_LETTER_PATTERN.sub('', text))
         total = len(text.replace(' ', ''))
 
         if total == 0:
@@ -0,0 +1,79 @@
+"""
+Dependency wiring shared by the API process and the queue workers
+"""
+
+import os
+from pathlib import Path
+
+# Import adapters
+from ..adapters.ml.two_stage_classifier import TwoStageClassifier
+from ..adapters.ml.cached_classifier import CachedClassifier
+from ..adapters.persistence.sqlite_job_repository import SQLiteJobRepository
+from ..adapters.persistence.sqlite_prediction_repository import SQLitePredictionRepository
+from ..adapters.queue.sqlite_job_queue import SQLiteJobQueue
+from ..adapters.storage.local_storage import LocalStorage
+from ..adapters.config.json_config import JsonConfig
+from ..adapters.explainability.tfidf_explainer import TfidfExplainer
+from ..adapters.explainability.nearest_example_index import NearestExampleIndex
+
+# Import policies
+from ..domain.policies import ConfidencePolicy, RiskPolicy
+
+# Import use cases
+from ..application.use_cases import ProcessJobUseCase
+
+
+class Container:
+    """Builds one process's adapters, policies and use cases"""
+
+    def __init__(self):
+        db_path = os.getenv("AURORA_DB_PATH", "storage/aurora.db")
+
+        self.job_repo = SQLiteJobRepository(db_path)
+        self.pred_repo = SQLitePredictionRepository(db_path)
+        self.job_queue = SQLiteJobQueue(
+            db_path,
+            max_attempts=int(os.getenv("JOB_MAX_ATTEMPTS", "3")),
+            retry_backoff_seconds=float(os.getenv("JOB_RETRY_BACKOFF_SECONDS", "10")),
+        )
+        self.storage = LocalStorage()
+        self.config = JsonConfig(
+            revalidate_seconds=float(os.getenv("CONFIG_REVALIDATE_SECONDS", "2"))
+        )
+
+        # Use TwoStageClassifier with the new models
+        self.base_classifier = TwoStageClassifier(
+            fiscal_model_path="models/koreksi_fiskal_lr.joblib",
+            tax_object_model_path="models/objek_pph_lr.joblib"
+        )
+
+        # Cache predictions by normalized account text (disk tier is optional)
+        self.classifier = CachedClassifier(
+            self.base_classifier,
+            max_entries=int(os.getenv("PREDICTION_CACHE_SIZE", "100000")),
+            disk_path=os.getenv("PREDICTION_CACHE_PATH") or None,
+        )
+
+        # Similar labeled examples (build_example_index.py); optional
+        index_path = os.getenv("NEAREST_EXAMPLES_PATH", "models/nearest_examples.joblib")
+        self.example_index = (
+            NearestExampleIndex.load(index_path)
+            if index_path and Path(index_path).exists() else None
+        )
+
+        # Explain each label with the coefficients of the model that predicts it
+        self.explainer = TfidfExplainer(
+            [self.base_classifier.fiscal_model, self.base_classifier.tax_object_model],
+            label_maps=[TwoStageClassifier.FISCAL_CORRECTION_MAP, TwoStageClassifier.TAX_OBJECT_MAP],
+            preprocess=self.base_classifier.normalize,
+            example_index=self.example_index,
+        )
+
+        scoring_config = self.config.get_scoring_config()
+        self.confidence_policy = ConfidencePolicy(**scoring_config["confidence"])
+        self.risk_policy = RiskPolicy(**scoring_config["risk"])
+
+        self.process_job_uc = ProcessJobUseCase(
+            self.job_repo, self.pred_repo, self.classifier, self.storage,
+            self.config, self.explainer, self.confidence_policy, self.risk_policy
+        )
@@ -2,28 +2,24 @@
 FastAPI application factory
 """
 
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Header, BackgroundTasks
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from typing import Optional
+from fastapi.responses import FileResponse, StreamingResponse, Response
+from pathlib import Path
+from typing import Optional, Dict, Tuple, Callable, Any
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import json
 import os
 
-# Import adapters
-from ..adapters.ml.tfidf_classifier import TfidfClassifier
-from ..adapters.ml.two_stage_classifier import TwoStageClassifier
-from ..adapters.persistence.sqlite_job_repository import SQLiteJobRepository
-from ..adapters.persistence.sqlite_prediction_repository import SQLitePredictionRepository
-from ..adapters.storage.local_storage import LocalStorage
-from ..adapters.config.json_config import JsonConfig
-from ..adapters.explainability.tfidf_explainer import TfidfExplainer
+from .container import Container
 
-# Import policies
-from ..domain.policies import ConfidencePolicy, RiskPolicy
+from ..adapters.config.cached_json_file import CachedJsonFile, thaw
+from ..domain.errors import FileTooLargeError
 
 # Import use cases
 from ..application.use_cases import (
-    CreateJobUseCase,
-    ProcessJobUseCase,
+    CreateJobUseCase, DownloadResultsUseCase, PredictDirectUseCase
 )
 from ..application.use_cases.inspect_file_use_case import InspectFileUseCase
 
@@ -43,30 +39,59 @@ app.add_middleware(
 )
 
 # Dependencies (Dependency Injection)
-job_repo = SQLiteJobRepository()
-pred_repo = SQLitePredictionRepository()
-storage = LocalStorage()
-config = JsonConfig()
-
-# Use TwoStageClassifier with the new models
-classifier = TwoStageClassifier(
-    fiscal_model_path="models/koreksi_fiskal_lr.joblib",
-    tax_object_model_path="models/objek_pph_lr.joblib"
+container = Container()
+job_repo = container.job_repo
+pred_repo = container.pred_repo
+job_queue = container.job_queue
+storage = container.storage
+config = container.config
+classifier = container.classifier
+explainer = container.explainer
+confidence_policy = container.confidence_policy
+risk_policy = container.risk_policy
+
+# Uploads are streamed to storage and rejected once they pass this size
+MAX_FILE_BYTES = int(float(os.getenv("MAX_FILE_SIZE_MB", "10")) * 1024 * 1024)
+create_job_uc = CreateJobUseCase(job_repo, storage, max_file_bytes=MAX_FILE_BYTES)
+inspect_file_uc = InspectFileUseCase()
+download_results_uc = DownloadResultsUseCase(pred_repo, job_repo)
+predict_direct_uc = PredictDirectUseCase(classifier, explainer, confidence_policy)
+
+# Direct analysis is CPU-bound: run it on a dedicated bounded pool so the
+# event loop keeps serving polling and health checks. Requests beyond the
+# concurrency limit wait for a slot, then get 503.
+DIRECT_PREDICT_WORKERS = int(os.getenv("DIRECT_PREDICT_WORKERS", "2"))
+DIRECT_PREDICT_MAX_CONCURRENCY = int(os.getenv("DIRECT_PREDICT_MAX_CONCURRENCY", "8"))
+DIRECT_PREDICT_QUEUE_TIMEOUT = float(os.getenv("DIRECT_PREDICT_QUEUE_TIMEOUT_SECONDS", "10"))
+direct_predict_executor = ThreadPoolExecutor(
+    max_workers=DIRECT_PREDICT_WORKERS, thread_name_prefix="direct-predict"
 )
+direct_predict_slots = asyncio.Semaphore(DIRECT_PREDICT_MAX_CONCURRENCY)
 
-# For explainer, we'll use the tax object model as the primary model
-explainer = TfidfExplainer(classifier.tax_object_model)
+# KBLI catalog, parsed once and revalidated like the config files
+kbli_catalog = CachedJsonFile(
+    Path(__file__).parent.parent.parent.parent / "aurora_v2" / "kbli_2025_kategori_A_B_D_to_V_2digit_keywords.json",
+    revalidate_seconds=float(os.getenv("CONFIG_REVALIDATE_SECONDS", "2")),
+)
 
-scoring_config = config.get_scoring_config()
-confidence_policy = ConfidencePolicy(**scoring_config["confidence"])
-risk_policy = RiskPolicy(**scoring_config["risk"])
+# Encoded bodies of cacheable JSON responses: key -> (etag, body)
+_rendered_json: Dict[str, Tuple[str, bytes]] = {}
+
+
+def _json_with_etag(request: Request, key: str, etag: str, build: Callable[[], Any]) -> Response:
+    """Serve a JSON body encoded once per etag; 304 if the client has it"""
+    etag_header = f'"{etag}"'
+    if_none_match = request.headers.get("if-none-match", "")
+    client_etags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    headers = {"ETag": etag_header, "Cache-Control": "no-cache"}
+    if etag_header in client_etags or "*" in client_etags:
+        return Response(status_code=304, headers=headers)
+
+    rendered = _rendered_json.get(key)
+    if rendered is None or rendered[0] != etag:
+        rendered = _rendered_json[key] = (etag, json.dumps(build()).encode("utf-8"))
+    return Response(content=rendered[1], media_type="application/json", headers=headers)
 
-create_job_uc = CreateJobUseCase(job_repo, storage)
-process_job_uc = ProcessJobUseCase(
-    job_repo, pred_repo, classifier, storage, config, explainer,
-    confidence_policy, risk_policy
-)
-inspect_file_uc = InspectFileUseCase()
 
 # API Key validation
 API_KEY = os.getenv("API_KEY", "aurora-dev-key")
@@ -85,19 +110,13 @@ async def inspect_file(
     """Inspect uploaded file and return metadata + preview"""
     verify_api_key(x_aurora_key)
 
-    try:
-        # Get file content
-        content = await file.read()
+    if file.size is not None and file.size > MAX_FILE_BYTES:
+        raise HTTPException(status_code=413, detail="File exceeds the upload size limit")
 
-        # Reset file pointer for potential reuse
+    try:
+        # Inspect the spooled upload in place; only the preview is parsed
         await file.seek(0)
-
-        # Use BytesIO for pandas compatibility
-        from io import BytesIO
-        file_stream = BytesIO(content)
-
-        # Inspect file
-        result = inspect_file_uc.execute(file_stream, file.filename)
+        result = inspect_file_uc.execute(file.file, file.filename)
 
         return result
     except ValueError as e:
@@ -112,7 +131,6 @@ async def create_job(
     business_type: str = Form(...),
     selected_categories: Optional[str] = Form(None),
     selected_divisions: Optional[str] = Form(None),
-    background_tasks: BackgroundTasks = None,
     x_aurora_key: str = Header(None)
 ):
     """Create new classification job"""
@@ -125,13 +143,16 @@ async def create_job(
     divisions = json.loads(selected_divisions) if selected_divisions else []
 
     # Create job
-    job = create_job_uc.execute(
-        file.file, file.filename, business_type
-    )
+    try:
+        job = create_job_uc.execute(
+            file.file, file.filename, business_type
+        )
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
 
-    # Process in background (pass categories and divisions for future use)
-    # Note: Currently the classifier doesn't filter by these, but they're available
-    background_tasks.add_task(process_job_uc.execute, job.job_id)
+    # Hand off to the worker pool (python -m src.frameworks.worker)
+    # Note: Currently the classifier doesn't filter by categories/divisions, but they're available
+    job_queue.enqueue(job.job_id)
 
     return {
         "job_id": job.job_id,
@@ -150,13 +171,7 @@ async def get_job(job_id: str, x_aurora_key: str = Header(None)):
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    # Calculate total_amount if job is completed
-    total_amount = None
-    if job.status.value == "completed":
-        rows = pred_repo.find_by_job(job_id, limit=10000, offset=0)
-        amounts = [r.amount for r in rows if r.amount is not None]
-        total_amount = sum(amounts) if amounts else 0
-
+    summary = job.summary
     return {
         "job_id": job.job_id,
         "status": job.status.value,
@@ -167,7 +182,11 @@ async def get_job(job_id: str, x_aurora_key: str = Header(None)):
             "total_rows": job.total_rows,
             "avg_confidence": job.avg_confidence,
             "risk_percent": job.risk_percent,
-            "total_amount": total_amount,
+            # Aggregates stored at completion; older jobs may not have them
+            "total_amount": summary.get("total_amount"),
+            "label_counts": summary.get("label_counts"),
+            "label_amounts": summary.get("label_amounts"),
+            "confidence_histogram": summary.get("confidence_histogram"),
         } if job.status.value == "completed" else None
     }
 
@@ -183,11 +202,13 @@ async def get_rows(
     verify_api_key(x_aurora_key)
 
     offset = (page - 1) * page_size
-    rows = pred_repo.find_by_job(job_id, page_size, offset)
+    batch = pred_repo.find_batch_by_job(job_id, page_size, offset)
     total = pred_repo.count_by_job(job_id)
 
-    return {
-        "rows": [row.to_dict() for row in rows],
+    # Plain JSON types straight from the batch columns: encode directly
+    # rather than walking every row through FastAPI's jsonable_encoder
+    body = {
+        "rows": batch.to_dicts(),
         "pagination": {
             "page": page,
             "page_size": page_size,
@@ -195,45 +216,43 @@ async def get_rows(
             "pages": (total + page_size - 1) // page_size
         }
     }
+    return Response(content=json.dumps(body).encode("utf-8"), media_type="application/json")
 
 
 @app.get("/api/config")
-async def get_config(x_aurora_key: str = Header(None)):
+async def get_config(request: Request, x_aurora_key: str = Header(None)):
     """Get configuration"""
     verify_api_key(x_aurora_key)
 
-    return {
-        "labels": config.get_labels(),
-        "scoring_config": config.get_scoring_config(),
-        "priors": config.get_priors(),
-    }
+    return _json_with_etag(
+        request, "config", config.get_etag(),
+        lambda: {
+            "labels": config.get_labels(),
+            "scoring_config": thaw(config.get_scoring_config()),
+            "priors": thaw(config.get_priors()),
+        }
+    )
 
 
 @app.get("/api/kbli/categories")
-async def get_kbli_categories(x_aurora_key: str = Header(None)):
+async def get_kbli_categories(request: Request, x_aurora_key: str = Header(None)):
     """Get KBLI categories and divisions from JSON"""
     verify_api_key(x_aurora_key)
 
-    import json
-    from pathlib import Path
-
-    # Load KBLI JSON file
-    kbli_file = Path(__file__).parent.parent.parent.parent / "aurora_v2" / "kbli_2025_kategori_A_B_D_to_V_2digit_keywords.json"
-
     try:
-        with open(kbli_file, 'r', encoding='utf-8') as f:
-            kbli_data = json.load(f)
-
-        return {
-            "metadata": kbli_data.get("metadata", {}),
-            "categories": kbli_data.get("categories", [])
-        }
+        snapshot = kbli_catalog.snapshot()
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="KBLI data file not found")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to load KBLI data: {str(e)}")
 
-
+    return _json_with_etag(
+        request, "kbli", snapshot.etag,
+        lambda: {
+            "metadata": thaw(snapshot.data.get("metadata", {})),
+            "categories": thaw(snapshot.data.get("categories", []))
+        }
+    )
 
 
 @app.post("/api/predict/direct")
@@ -255,35 +274,24 @@ async def predict_direct(request: dict, x_aurora_key: str = Header(None)):
         # Note: For now, we'll use the standard classifier
         # In future, you can filter models based on selected_divisions
         # For example: Load specific models for selected business types
-
-        # Predict using classifier
-        predictions_raw = classifier.predict_proba(texts)
-
-        results = []
-        for idx, (text, prob_dist) in enumerate(zip(texts, predictions_raw)):
-            # Get predicted label
-            predicted_label_str = max(prob_dist, key=prob_dist.get)
-
-            # Calculate confidence
-            confidence, signals = confidence_policy.calculate(prob_dist, text)
-
-            # Get explanation
-            try:
-                top_terms = explainer.get_top_terms(text, predicted_label_str, limit=5)
-                explanation = f"Based on terms: {', '.join(top_terms[:3])}" if top_terms else "Classification based on text pattern"
-            except:
-                explanation = f"Classified as {predicted_label_str} based on text analysis"
-
-            results.append({
-                "account_name": text,
-                "predicted_label": predicted_label_str,
-                "confidence": confidence.score,
-                "explanation": explanation,
-                "business_context": {
-                    "categories": selected_categories,
-                    "divisions": selected_divisions
-                } if selected_divisions else None
-            })
+        try:
+            await asyncio.wait_for(direct_predict_slots.acquire(), DIRECT_PREDICT_QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=503, detail="Direct analysis is busy, retry later")
+        try:
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(
+                direct_predict_executor, predict_direct_uc.execute, texts
+            )
+        finally:
+            direct_predict_slots.release()
+
+        business_context = {
+            "categories": selected_categories,
+            "divisions": selected_divisions
+        } if selected_divisions else None
+        for result in results:
+            result["business_context"] = business_context
 
         return {"predictions": results}
     except HTTPException:
@@ -293,8 +301,12 @@ async def predict_direct(request: dict, x_aurora_key: str = Header(None)):
 
 
 @app.get("/api/jobs/{job_id}/download")
-async def download_results(job_id: str, x_aurora_key: str = Header(None)):
-    from fastapi.responses import Response
+async def download_results(
+    job_id: str,
+    compress: Optional[str] = None,
+    x_aurora_key: str = Header(None)
+):
+    """Stream all prediction rows as CSV (compress=gzip for a .csv.gz)"""
     verify_api_key(x_aurora_key)
 
     job = job_repo.find_by_id(job_id)
@@ -304,34 +316,25 @@ async def download_results(job_id: str, x_aurora_key: str = Header(None)):
     if job.status.value != "completed":
         raise HTTPException(status_code=400, detail="Job not completed")
 
-    rows = pred_repo.find_by_job(job_id, limit=10000, offset=0)
-
-    import csv
-    from io import StringIO
-    output = StringIO()
-
-    if rows:
-        fieldnames = ["row_index", "account_name", "predicted_tax_object",
-                     "confidence_percent", "explanation"]
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for row in rows:
-            writer.writerow({
-                "row_index": row.row_index,
-                "account_name": row.account_name,
-                "predicted_tax_object": str(row.predicted_label),
-                "confidence_percent": row.confidence.score,
-                "explanation": row.explanation
-            })
-
-    return Response(
-        content=output.getvalue(),
-        media_type="text/csv",
-        headers={"Content-Disposition": f"attachment; filename={job_id}_results.csv"}
+    if compress not in (None, "gzip"):
+        raise HTTPException(status_code=400, detail="Unsupported compression")
+
+    gzip = compress == "gzip"
+    filename = f"{job_id}_results.csv.gz" if gzip else f"{job_id}_results.csv"
+
+    # Sync generator: Starlette pulls each page in its threadpool
+    return StreamingResponse(
+        download_results_uc.execute(job_id, compress=gzip),
+        media_type="application/gzip" if gzip else "text/csv",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
 
 
+@app.on_event("shutdown")
+def shutdown_executors():
+    direct_predict_executor.shutdown(wait=False, cancel_futures=True)
+
+
 @app.get("/api/healthz")
 async def health():
     """Health check"""
@@ -0,0 +1,172 @@
+"""
+Queue worker pool - processes jobs enqueued by the API.
+
+Run from the backend directory with:
+    python -m src.frameworks.worker --workers 4
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+from pathlib import Path
+from dotenv import load_dotenv
+
+from ..domain.entities import JobStatus
+from ..domain.errors import JobCancelledError
+
+logger = logging.getLogger(__name__)
+
+
+class _Heartbeat(threading.Thread):
+    """
+    Keeps a job lease alive while the job is being processed.
+
+    Once the lease is lost it stays lost: the job may already have been
+    reclaimed by another worker, so this one must stop writing to it.
+    """
+
+    def __init__(self, job_queue, job_id: str, worker_id: str, lease_seconds: float):
+        super().__init__(daemon=True)
+        self.job_queue = job_queue
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.stopped = threading.Event()
+        self.lost = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.lease_seconds / 3):
+            if not self.owns_lease():
+                return
+
+    def owns_lease(self) -> bool:
+        """
+        Renew the lease and report whether it is still held. A True result
+        leaves a full lease period for the write that follows.
+        """
+        if self.lost.is_set():
+            return False
+        if not self.job_queue.heartbeat(self.job_id, self.worker_id, self.lease_seconds):
+            if not self.lost.is_set():
+                logger.warning("Lost lease on job %s", self.job_id)
+            self.lost.set()
+            return False
+        return True
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join()
+
+
+def run_worker(
+    worker_id: str,
+    stop_event,
+    poll_interval: float = 1.0,
+    lease_seconds: float = 60.0,
+) -> None:
+    """Claim and process jobs until stop_event is set"""
+    # Build dependencies inside the worker process (models, connections)
+    from .container import Container
+    container = Container()
+    job_queue = container.job_queue
+    job_repo = container.job_repo
+    pred_repo = container.pred_repo
+
+    logger.info("Worker %s started", worker_id)
+    while not stop_event.is_set():
+        for job_id in job_queue.reap_expired():
+            job = job_repo.find_by_id(job_id)
+            if job and not job.is_terminal():
+                job.mark_failed("Worker lease expired")
+                job_repo.save(job)
+
+        claimed = job_queue.claim(worker_id, lease_seconds)
+        if claimed is None:
+            stop_event.wait(poll_interval)
+            continue
+
+        job = job_repo.find_by_id(claimed.job_id)
+        if job is None or job.status == JobStatus.COMPLETED:
+            job_queue.complete(claimed.job_id, worker_id)
+            continue
+        if job.status != JobStatus.PENDING:
+            # Previous attempt crashed or failed: start from a clean slate
+            pred_repo.delete_by_job(job.job_id)
+            job.reset_for_retry()
+            job_repo.save(job)
+
+        logger.info("Worker %s processing %s (attempt %d)", worker_id, job.job_id, claimed.attempts)
+        heartbeat = _Heartbeat(job_queue, job.job_id, worker_id, lease_seconds)
+        heartbeat.start()
+        try:
+            container.process_job_uc.execute(
+                job.job_id, should_stop=lambda: not heartbeat.owns_lease()
+            )
+            if not job_queue.complete(job.job_id, worker_id):
+                logger.warning("Worker %s finished %s after losing its lease", worker_id, job.job_id)
+        except JobCancelledError:
+            # Another worker owns the job now; leave its state to that worker
+            logger.warning("Worker %s abandoned %s: lease lost", worker_id, job.job_id)
+        except Exception as e:
+            logger.exception("Job %s failed", job.job_id)
+            if job_queue.fail(job.job_id, worker_id, str(e)):
+                # Retry scheduled: show the job as pending again, not failed
+                job = job_repo.find_by_id(job.job_id)
+                pred_repo.delete_by_job(job.job_id)
+                job.reset_for_retry()
+                job_repo.save(job)
+        finally:
+            heartbeat.stop()
+
+    logger.info("Worker %s stopped", worker_id)
+
+
+def _worker_main(worker_id: str, stop_event, poll_interval: float, lease_seconds: float) -> None:
+    # Children ignore SIGINT; the parent sets stop_event for a clean shutdown
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+    run_worker(worker_id, stop_event, poll_interval, lease_seconds)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AURORA job worker pool")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WORKER_PROCESSES", "2")))
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--lease-seconds", type=float, default=60.0)
+    args = parser.parse_args()
+
+    env_path = Path(__file__).parent.parent.parent.parent / ".env"
+    load_dotenv(dotenv_path=env_path)
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+
+    ctx = multiprocessing.get_context("spawn")
+    stop_event = ctx.Event()
+    host = socket.gethostname()
+    processes = [
+        ctx.Process(
+            target=_worker_main,
+            args=(f"{host}-{os.getpid()}-{i}", stop_event, args.poll_interval, args.lease_seconds),
+            name=f"aurora-worker-{i}",
+        )
+        for i in range(args.workers)
+    ]
+    for p in processes:
+        p.start()
+
+    def shutdown(signum, frame):
+        logger.info("Shutting down %d workers", len(processes))
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    for p in processes:
+        p.join()
+
+
+if __name__ == "__main__":
+    main()